@@ -1,17 +1,40 @@
-from .composer import EinkComposer
-from .dithering import floyd_steinberg_dither, threshold_dither
-from .image_ops import resize_image, flip_horizontal, rotate_ccw_90, invert_colors
-from .template_renderer import TemplateRenderer, create_template_from_dict
+# Public names are resolved on first access so that `import eink_composer`
+# does not pull in numpy/Pillow until something actually needs them.
+# Static type checkers and IDEs read the eager imports in __init__.pyi.
+_submodules = ["composer", "dithering", "image_ops", "template_renderer", "cli"]
+_submod_attrs = {
+    "composer": ["EinkComposer"],
+    "template_renderer": ["TemplateRenderer", "create_template_from_dict"],
+    "dithering": ["floyd_steinberg_dither", "threshold_dither"],
+    "image_ops": ["resize_image", "flip_horizontal", "rotate_ccw_90", "invert_colors"],
+}
 
 __version__ = "0.1.0"
-__all__ = [
-    "EinkComposer",
-    "TemplateRenderer",
-    "create_template_from_dict",
-    "floyd_steinberg_dither",
-    "threshold_dither",
-    "resize_image",
-    "flip_horizontal",
-    "rotate_ccw_90",
-    "invert_colors"
-]
\ No newline at end of file
+
+# Try to use scientific-python's lazy_loader (SPEC 1)
+try:
+    import lazy_loader as lazy
+    __getattr__, __dir__, __all__ = lazy.attach(
+        __name__, submodules=_submodules, submod_attrs=_submod_attrs
+    )
+except ImportError:
+    import importlib
+    
+    _attr_to_module = {
+        attr: module for module, attrs in _submod_attrs.items() for attr in attrs
+    }
+    __all__ = sorted(list(_attr_to_module) + _submodules)
+    
+    def __getattr__(name):
+        """Import a public name or submodule on first access."""
+        if name in _submodules:
+            return importlib.import_module(f"{__name__}.{name}")
+        if name in _attr_to_module:
+            module = importlib.import_module(f"{__name__}.{_attr_to_module[name]}")
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    def __dir__():
+        return __all__.copy()
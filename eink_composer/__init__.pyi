@@ -0,0 +1,23 @@
+from . import cli, composer, dithering, image_ops, template_renderer
+from .composer import EinkComposer
+from .dithering import floyd_steinberg_dither, threshold_dither
+from .image_ops import resize_image, flip_horizontal, rotate_ccw_90, invert_colors
+from .template_renderer import TemplateRenderer, create_template_from_dict
+
+__version__: str
+__all__ = [
+    "EinkComposer",
+    "TemplateRenderer",
+    "create_template_from_dict",
+    "floyd_steinberg_dither",
+    "threshold_dither",
+    "resize_image",
+    "flip_horizontal",
+    "rotate_ccw_90",
+    "invert_colors",
+    "cli",
+    "composer",
+    "dithering",
+    "image_ops",
+    "template_renderer",
+]
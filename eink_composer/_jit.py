@@ -0,0 +1,12 @@
+"""Optional Numba support for the pixel kernels."""
+
+# Try to import Numba for JIT-compiled kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when Numba is not installed."""
+        return lambda func: func
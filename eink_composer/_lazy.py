@@ -0,0 +1,25 @@
+"""Deferred module imports."""
+
+import importlib
+
+
+class _LazyModule:
+    """Proxy that imports a module on first attribute access."""
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+    
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> _LazyModule:
+    """Return a proxy for module `name` that is imported when first used."""
+    return _LazyModule(name)
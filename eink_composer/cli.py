@@ -6,7 +6,10 @@ import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-from .composer import EinkComposer
+from ._lazy import lazy_import
+
+# numpy/Pillow are only loaded once a command actually builds a composition
+composer = lazy_import('eink_composer.composer')
 
 # Try to import hardware display support
 try:
@@ -209,7 +212,7 @@ class ComposerSession:
         """Ensure a composer exists, creating a default one if needed."""
         if not self.composer:
             print(f"No active composition found. Creating default {default_width}x{default_height} composition...")
-            self.composer = EinkComposer(default_width, default_height)
+            self.composer = composer.EinkComposer(default_width, default_height)
             self.save_session()
             print(f"✓ Created default {default_width}x{default_height} composition")
     
@@ -219,7 +222,7 @@ class ComposerSession:
             try:
                 with open(self.session_file) as f:
                     data = json.load(f)
-                    self.composer = EinkComposer(data['width'], data['height'])
+                    self.composer = composer.EinkComposer(data['width'], data['height'])
                     # Restore layers
                     for layer_data in data.get('layers', []):
                         self._restore_layer(layer_data)
@@ -310,7 +313,7 @@ def main():
             print(f"Error: Invalid size format '{args.size}'. Use WIDTHxHEIGHT", file=sys.stderr)
             sys.exit(1)
         
-        session.composer = EinkComposer(width, height)
+        session.composer = composer.EinkComposer(width, height)
         session.save_session()
         print(f"Created new {width}x{height} composition")
         
@@ -399,7 +402,7 @@ def main():
             print("✓ Cleared existing session")
         
         # Create new session
-        session.composer = EinkComposer(width, height)
+        session.composer = composer.EinkComposer(width, height)
         session.save_session()
         print(f"✓ Created new {width}x{height} composition")
         print("Session reset complete")
@@ -455,7 +458,7 @@ def main():
             with open(args.filename) as f:
                 data = json.load(f)
             
-            session.composer = EinkComposer(data['width'], data['height'])
+            session.composer = composer.EinkComposer(data['width'], data['height'])
             
             # Restore layers
             for layer_data in data.get('layers', []):
@@ -1,15 +1,63 @@
 import numpy as np
 from PIL import Image
-from typing import List, Dict, Optional, Literal, Any, Union
+from typing import List, Dict, Optional, Literal, Any, Tuple, Union
 from dataclasses import dataclass, field
+import sys
 import uuid
+import os
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+from ._jit import NUMBA_AVAILABLE
 from .dithering import floyd_steinberg_dither, threshold_dither, pack_bits
-from .image_ops import resize_image, flip_horizontal, rotate_ccw_90, invert_colors
+from .image_ops import (resize_image, flip_horizontal, rotate_ccw_90, invert_colors,
+                        apply_orientation, draw_rectangles, draw_rectangles_cv2, CV2_AVAILABLE,
+                        make_qr_placeholder)
 from .text import render_text, measure_text
 
+# Layers use __slots__ where dataclasses support it (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Processed image tiles shared by all compositions, least recently used first.
+# Keys hold the source path, its mtime and every processing parameter, so a
+# template loaded into a new composition reuses an earlier dithering result
+_TILE_CACHE_SIZE = 64
+_tile_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_tile_cache_lock = threading.Lock()
+
+# Source of layer revisions; next() on a count is atomic, so concurrent
+# changes never hand out the same value
+_revisions = itertools.count(1)
+
+# Worker threads for processing image tiles concurrently, shared by all
+# compositions (threads are only started once work is submitted). The pixel
+# kernels run with the GIL released, so tiles really do overlap
+_tile_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                    thread_name_prefix='eink-tiles')
+
+
+def _get_shared_tile(key: tuple) -> Optional[np.ndarray]:
+    """Look up a processed tile in the shared cache."""
+    with _tile_cache_lock:
+        tile = _tile_cache.get(key)
+        if tile is not None:
+            _tile_cache.move_to_end(key)
+        return tile
+
+
+def _put_shared_tile(key: tuple, tile: np.ndarray) -> None:
+    """Store a processed tile (made read-only) in the shared cache."""
+    tile.flags.writeable = False
+    with _tile_cache_lock:
+        _tile_cache[key] = tile
+        _tile_cache.move_to_end(key)
+        while len(_tile_cache) > _TILE_CACHE_SIZE:
+            _tile_cache.popitem(last=False)
+
+
+@dataclass(**_SLOTS)
 class Layer:
     """Base layer class."""
     id: str
@@ -19,7 +67,7 @@ class Layer:
     y: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ImageLayer(Layer):
     """Image layer with processing options."""
     type: str = field(default="image", init=False)
@@ -36,9 +84,12 @@ class ImageLayer(Layer):
     crop_y: Optional[int] = None  # Y position for crop (None = center)
     width: Optional[int] = None  # Custom width (None = auto-calculate from canvas)
     height: Optional[int] = None  # Custom height (None = auto-calculate from canvas)
+    already_binary: bool = False  # Pixels are already 0/255, so dithering can be skipped
+    placeholder_type: Optional[str] = None  # Template placeholder kind ('qr')
+    error_correction: Optional[str] = None  # QR error correction level for placeholders
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TextLayer(Layer):
     """Text layer."""
     type: str = field(default="text", init=False)
@@ -50,9 +101,10 @@ class TextLayer(Layer):
     font_size: int = 1  # Font scale factor (1=normal, 2=double, etc.)
     background: bool = False  # Whether to draw white background
     padding: int = 2  # Padding around text background
+    placeholder_type: Optional[str] = None  # Template placeholder kind ('ip')
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RectangleLayer(Layer):
     """Rectangle layer."""
     type: str = field(default="rectangle", init=False)
@@ -67,19 +119,116 @@ class EinkComposer:
     E-ink display composer for creating layered templates.
     """
     
-    def __init__(self, width: int = 250, height: int = 128):
+    def __init__(self, width: int = 250, height: int = 128, bpp: Literal[1, 8] = 8):
         """
         Initialize composer with display dimensions.
         
         Args:
             width: Display width in pixels
             height: Display height in pixels
+            bpp: Canvas bit depth. 8 keeps a grayscale uint8 canvas; 1 keeps a
+                packed bit plane (8 pixels per byte, MSB first, rows padded to
+                whole bytes) for 1-bit output, thresholding every layer at 128
         """
+        if bpp not in (1, 8):
+            raise ValueError(f"Unsupported bit depth {bpp}, expected 1 or 8")
         self.width = width
         self.height = height
+        self.bpp = bpp
         self.layers: List[Layer] = []
-        self.canvas = np.full((height, width), 255, dtype=np.uint8)  # White background
+        self.revision = 0  # Changes whenever the layers change (see mark_changed)
+        self.canvas = np.zeros(self._canvas_shape(), dtype=np.uint8)
+        self._clear_canvas(255)  # White background
+        self._layer_cache: Dict[str, tuple] = {}  # layer id -> (cache key, processed tile)
+        self._scratch: Dict[Any, np.ndarray] = {}  # dtype -> reusable flat buffer
+        
+        # Per-type render handlers (rectangles are batched separately in render())
+        self._dispatch = {
+            ImageLayer: self._render_image_layer,
+            TextLayer: self._render_text_layer,
+        }
+        
+    def _canvas_shape(self) -> Tuple[int, int]:
+        """Shape of the canvas array for the current size and bit depth."""
+        if self.bpp == 1:
+            return (self.height, (self.width + 7) // 8)
+        return (self.height, self.width)
+    
+    def _clear_canvas(self, background_color: int):
+        """Fill the canvas with the background color."""
+        if self.bpp == 8:
+            self.canvas.fill(background_color)
+            return
+        
+        self.canvas.fill(0xFF if background_color > 128 else 0)
+        # Keep the row padding bits zero, matching pack_bits
+        if self.width % 8:
+            self.canvas[:, -1] &= (0xFF << (8 - self.width % 8)) & 0xFF
+    
+    def _blit_bits(self, x: int, y: int, values: np.ndarray, cover: Optional[np.ndarray] = None):
+        """
+        Write a clipped region into the packed 1-bit canvas.
+        
+        Args:
+            x, y: Top-left canvas position (non-negative)
+            values: Boolean region, True = white
+            cover: Boolean mask of pixels to write (None = the whole region)
+        """
+        h, w = values.shape
+        shift = x % 8
+        
+        # Align the region to byte boundaries by padding on the left
+        bits = np.zeros((h, shift + w), dtype=bool)
+        bits[:, shift:] = values
+        mask = np.zeros((h, shift + w), dtype=bool)
+        mask[:, shift:] = True if cover is None else cover
+        bits = np.packbits(bits, axis=1)
+        mask = np.packbits(mask, axis=1)
+        
+        region = self.canvas[y:y + h, x // 8:x // 8 + bits.shape[1]]
+        region &= ~mask
+        region |= bits & mask
+    
+    def _get_scratch(self, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """
+        Get a reusable scratch array, growing the backing buffer only when needed.
         
+        The contents are undefined and are overwritten by the next caller, so
+        scratch arrays must never be stored past the current render step.
+        """
+        size = int(np.prod(shape))
+        buf = self._scratch.get(np.dtype(dtype))
+        if buf is None or buf.size < size:
+            buf = np.empty(size, dtype=dtype)
+            self._scratch[np.dtype(dtype)] = buf
+        return buf[:size].reshape(shape)
+
+    def __getstate__(self):
+        """Pickle the layers and canvas only; caches and scratch buffers are rebuilt."""
+        state = self.__dict__.copy()
+        for name in ('_layer_cache', '_scratch', '_dispatch'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._layer_cache = {}
+        self._scratch = {}
+        self._dispatch = {
+            ImageLayer: self._render_image_layer,
+            TextLayer: self._render_text_layer,
+        }
+
+    def mark_changed(self):
+        """
+        Record that the layers changed.
+        
+        Called by the layer methods below; code that edits self.layers or
+        layer attributes directly must call it too. Caches of layer-derived
+        data can compare self.revision to detect changes.
+        """
+        self.revision = next(_revisions)
+    
     def add_image_layer(self, layer_id: str, image_path: str, 
                        x: int = 0, y: int = 0,
                        resize_mode: Literal['stretch', 'fit', 'crop'] = 'fit',
@@ -127,6 +276,50 @@ class EinkComposer:
             height=height
         )
         self.layers.append(layer)
+        self.mark_changed()
+        return layer_id
+    
+    def add_image_layer_from_array(self, layer_id: str, image_data: np.ndarray,
+                                   x: int = 0, y: int = 0,
+                                   resize_mode: Literal['stretch', 'fit', 'crop'] = 'fit',
+                                   dither_mode: Literal['floyd-steinberg', 'threshold', 'none'] = 'floyd-steinberg',
+                                   brightness: float = 1.0, contrast: float = 0.0,
+                                   rotate: int = 0, flip_h: bool = False, flip_v: bool = False,
+                                   crop_x: Optional[int] = None, crop_y: Optional[int] = None,
+                                   width: Optional[int] = None, height: Optional[int] = None,
+                                   already_binary: bool = False) -> str:
+        """
+        Add an image layer from an in-memory grayscale array.
+        
+        Args:
+            layer_id: Unique layer identifier
+            image_data: Grayscale image as uint8 numpy array
+            already_binary: Image only contains 0/255 values (skips dithering
+                when no resampling or adjustment is needed)
+            (remaining arguments as in add_image_layer)
+            
+        Returns:
+            Layer ID
+        """
+        layer = ImageLayer(
+            id=layer_id,
+            x=x, y=y,
+            image_data=image_data,
+            resize_mode=resize_mode,
+            dither_mode=dither_mode,
+            brightness=brightness,
+            contrast=contrast,
+            rotate=rotate,
+            flip_h=flip_h,
+            flip_v=flip_v,
+            crop_x=crop_x,
+            crop_y=crop_y,
+            width=width,
+            height=height,
+            already_binary=already_binary
+        )
+        self.layers.append(layer)
+        self.mark_changed()
         return layer_id
     
     def add_text_layer(self, layer_id: str, text: str, 
@@ -155,6 +348,7 @@ class EinkComposer:
                           rotate=rotate, flip_h=flip_h, flip_v=flip_v,
                           font_size=font_size, background=background, padding=padding)
         self.layers.append(layer)
+        self.mark_changed()
         return layer_id
     
     def add_rectangle_layer(self, layer_id: str, 
@@ -180,11 +374,14 @@ class EinkComposer:
             filled=filled, color=color
         )
         self.layers.append(layer)
+        self.mark_changed()
         return layer_id
     
     def remove_layer(self, layer_id: str) -> bool:
         """Remove a layer by ID."""
         self.layers = [l for l in self.layers if l.id != layer_id]
+        self._layer_cache.pop(layer_id, None)
+        self.mark_changed()
         return True
     
     def update_layer(self, layer_id: str, **kwargs) -> bool:
@@ -192,9 +389,11 @@ class EinkComposer:
         for layer in self.layers:
             if layer.id == layer_id:
                 # Check if this is a QR placeholder and if dimensions are changing
-                is_qr_placeholder = hasattr(layer, 'placeholder_type') and layer.placeholder_type == 'qr'
+                is_qr_placeholder = getattr(layer, 'placeholder_type', None) == 'qr'
                 dimensions_changing = is_qr_placeholder and ('width' in kwargs or 'height' in kwargs)
                 
+                self._layer_cache.pop(layer_id, None)
+                
                 # Update properties
                 for key, value in kwargs.items():
                     if hasattr(layer, key):
@@ -202,27 +401,11 @@ class EinkComposer:
                 
                 # Regenerate QR placeholder image if dimensions changed
                 if dimensions_changing:
-                    import numpy as np
                     width = layer.width or 70  # Default width if None
                     height = layer.height or 70  # Default height if None
-                    
-                    # Create a new placeholder pattern for preview
-                    placeholder_img = np.full((height, width), 255, dtype=np.uint8)  # White background
-                    # Add a simple border and "QR" text pattern
-                    placeholder_img[0:2, :] = 0  # Top border
-                    placeholder_img[-2:, :] = 0  # Bottom border 
-                    placeholder_img[:, 0:2] = 0  # Left border
-                    placeholder_img[:, -2:] = 0  # Right border
-                    
-                    # Add "QR" text in center (simplified)
-                    center_y, center_x = height // 2, width // 2
-                    if height > 10 and width > 20:  # Only if big enough
-                        placeholder_img[max(0, center_y-5):min(height, center_y+5), 
-                                      max(0, center_x-10):min(width, center_x+10)] = 0
-                    
-                    # Update the layer's image data
-                    layer.image_data = placeholder_img
+                    layer.image_data = make_qr_placeholder(width, height)
                 
+                self.mark_changed()
                 return True
         return False
     
@@ -231,6 +414,7 @@ class EinkComposer:
         for layer in self.layers:
             if layer.id == layer_id:
                 layer.visible = not layer.visible
+                self.mark_changed()
                 return True
         return False
     
@@ -257,39 +441,96 @@ class EinkComposer:
         
         # Insert at new position
         self.layers.insert(new_index, layer_to_move)
+        self.mark_changed()
         
         return True
     
-    def _render_image_layer(self, layer: ImageLayer):
-        """Render an image layer to canvas."""
-        if not layer.visible:
-            return
+    def _image_cache_key(self, layer: ImageLayer, target_width: int, target_height: int,
+                         visible: tuple) -> Optional[tuple]:
+        """Build the processed-tile cache key for a file-backed image layer."""
+        if layer.image_data is not None or not layer.image_path:
+            return None
+        try:
+            mtime = os.stat(layer.image_path).st_mtime_ns
+        except OSError:
+            return None
+        return (layer.image_path, mtime, layer.resize_mode, target_width, target_height, visible,
+                layer.brightness, layer.contrast, layer.rotate, layer.flip_h, layer.flip_v,
+                layer.crop_x, layer.crop_y, layer.dither_mode)
+    
+    def _process_image_layer(self, layer: ImageLayer, target_width: int, target_height: int,
+                             visible: tuple, use_scratch: bool = True) -> Optional[np.ndarray]:
+        """
+        Load, transform, resize, adjust and dither an image layer.
+        
+        Args:
+            layer: Image layer to process
+            target_width, target_height: Full size of the resized layer
+            visible: (x1, y1, x2, y2) region of the resized layer that lands on
+                the canvas; only this region is adjusted and dithered
+            use_scratch: Allow the shared scratch buffer (not thread-safe)
             
+        Returns:
+            Processed tile covering the visible region, or None if the layer has no image
+        """
         # Load image
         if layer.image_data is not None:
             img = layer.image_data
         elif layer.image_path:
             pil_img = Image.open(layer.image_path).convert('L')
-            img = np.array(pil_img)
+            img = np.asarray(pil_img)  # Read-only is fine; every later step allocates
         else:
-            return
+            return None
         
-        # Apply transformations first (before resizing)
-        if layer.flip_h:
-            img = flip_horizontal(img)
-        if layer.flip_v:
-            from .image_ops import flip_vertical
-            img = flip_vertical(img)
+        # Apply flips and rotation first (before resizing)
+        if layer.flip_h or layer.flip_v or layer.rotate % 360:
+            img = apply_orientation(img, layer.flip_h, layer.flip_v, layer.rotate)
         
-        # Apply rotation
-        if layer.rotate != 0:
-            # Normalize rotation to 0, 90, 180, 270
-            rotations = (layer.rotate % 360) // 90
-            for _ in range(rotations):
-                img = rotate_ccw_90(img)
+        # Resize after transformations; resampling introduces gray levels
+        binary = layer.already_binary
+        if img.shape != (target_height, target_width):
+            binary = False
+            img = resize_image(img, target_width, target_height, 
+                             mode=layer.resize_mode, 
+                             crop_x=layer.crop_x, 
+                             crop_y=layer.crop_y)
+        
+        # Drop the off-canvas part before the per-pixel passes
+        x1, y1, x2, y2 = visible
+        img = img[y1:y2, x1:x2]
+        
+        # Apply brightness/contrast; the result only needs to outlive the
+        # dither pass, so it can go into scratch unless it is the final tile
+        if layer.brightness != 1.0 or layer.contrast != 0:
+            from .image_ops import adjust_brightness_contrast
+            binary = False
+            out = None
+            if use_scratch and layer.dither_mode in ('floyd-steinberg', 'threshold'):
+                out = self._get_scratch(img.shape)
+            img = adjust_brightness_contrast(img, layer.brightness, layer.contrast, out=out)
+        
+        # Apply dithering, unless the pixels are already 0/255
+        if not binary:
+            if layer.dither_mode == 'floyd-steinberg':
+                img = floyd_steinberg_dither(img)
+            elif layer.dither_mode == 'threshold':
+                img = threshold_dither(img)
+        
+        return img
+    
+    def _image_layer_geometry(self, layer: ImageLayer) -> Optional[tuple]:
+        """
+        Work out where an image layer lands on the canvas.
+        
+        Returns:
+            (target_width, target_height, visible, x, y) tuple, where visible is
+            the (x1, y1, x2, y2) on-canvas region of the resized layer, or None
+            if nothing of the layer is visible
+        """
+        if not layer.visible:
+            return None
         
         # Calculate target size based on custom dimensions or canvas size
-        # After rotation, dimensions might have changed
         if layer.width is not None and layer.height is not None:
             target_width = layer.width
             target_height = layer.height
@@ -297,31 +538,114 @@ class EinkComposer:
             target_width = self.width - layer.x
             target_height = self.height - layer.y
         
-        # Resize after transformations
-        if img.shape != (target_height, target_width):
-            img = resize_image(img, target_width, target_height, 
-                             mode=layer.resize_mode, 
-                             crop_x=layer.crop_x, 
-                             crop_y=layer.crop_y)
+        # Clip the layer footprint to the canvas and skip it if nothing is visible
+        dst_x1 = max(0, layer.x)
+        dst_y1 = max(0, layer.y)
+        dst_x2 = min(self.width, layer.x + target_width)
+        dst_y2 = min(self.height, layer.y + target_height)
+        if dst_x1 >= dst_x2 or dst_y1 >= dst_y2:
+            return None
+        visible = (dst_x1 - layer.x, dst_y1 - layer.y, dst_x2 - layer.x, dst_y2 - layer.y)
+        return target_width, target_height, visible, dst_x1, dst_y1
+    
+    def _cached_image_tile(self, layer: ImageLayer, cache_key: Optional[tuple]) -> Optional[np.ndarray]:
+        """Look up a layer's processed tile in its own cache, then the shared one."""
+        if cache_key is None:
+            return None
+        cached = self._layer_cache.get(layer.id)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        img = _get_shared_tile(cache_key)
+        if img is not None:
+            self._layer_cache[layer.id] = (cache_key, img)
+        return img
+    
+    def _plan_image_layer(self, layer: ImageLayer) -> Optional[tuple]:
+        """
+        Look up everything needed to produce an image layer's tile.
         
-        # Apply brightness/contrast
-        if layer.brightness != 1.0 or layer.contrast != 0:
-            from .image_ops import adjust_brightness_contrast
-            img = adjust_brightness_contrast(img, layer.brightness, layer.contrast)
+        Returns:
+            (geometry, cache key, cached tile or None) tuple, or None if
+            nothing of the layer is visible
+        """
+        geometry = self._image_layer_geometry(layer)
+        if geometry is None:
+            return None
+        target_width, target_height, visible, _, _ = geometry
+        cache_key = self._image_cache_key(layer, target_width, target_height, visible)
+        return geometry, cache_key, self._cached_image_tile(layer, cache_key)
+    
+    def _prepare_image_layer_tile(self, layer: ImageLayer, use_scratch: bool = True,
+                                  plan: Optional[tuple] = None) -> Optional[Tuple[np.ndarray, int, int]]:
+        """
+        Produce an image layer's processed tile and its canvas position.
         
-        # Apply dithering
-        if layer.dither_mode == 'floyd-steinberg':
-            img = floyd_steinberg_dither(img)
-        elif layer.dither_mode == 'threshold':
-            img = threshold_dither(img)
+        The canvas is not touched, so tiles for different layers can be
+        prepared concurrently (with use_scratch=False).
         
-        # Composite onto canvas
-        h, w = img.shape
-        y_end = min(layer.y + h, self.height)
-        x_end = min(layer.x + w, self.width)
+        Args:
+            layer: Image layer to prepare
+            use_scratch: Allow the shared scratch buffer (not thread-safe)
+            plan: Result of _plan_image_layer() for the layer, if already known
+            
+        Returns:
+            (tile, x, y) tuple, or None if nothing of the layer is visible
+        """
+        if plan is None:
+            plan = self._plan_image_layer(layer)
+            if plan is None:
+                return None
+        (target_width, target_height, visible, x, y), cache_key, img = plan
+        
+        # Reuse the processed tile if the source file and parameters are unchanged
+        if img is None:
+            img = self._process_image_layer(layer, target_width, target_height, visible, use_scratch)
+            if img is None:
+                return None
+            if cache_key is not None:
+                _put_shared_tile(cache_key, img)
+                self._layer_cache[layer.id] = (cache_key, img)
+        
+        return img, x, y
+    
+    def _prepare_image_tiles(self) -> Dict[int, Optional[tuple]]:
+        """
+        Prepare the tiles of all image layers, keyed by id(layer).
         
-        if layer.y < self.height and layer.x < self.width:
-            self.canvas[layer.y:y_end, layer.x:x_end] = img[:y_end-layer.y, :x_end-layer.x]
+        Tiles don't depend on the canvas, so when several layers miss the
+        tile cache they are processed concurrently; cached tiles and a
+        single miss are handled inline.
+        """
+        plans = [(layer, self._plan_image_layer(layer))
+                 for layer in self.layers if type(layer) is ImageLayer]
+        misses = [(layer, plan) for layer, plan in plans if plan is not None and plan[2] is None]
+        
+        tiles = {}
+        if len(misses) > 1:
+            futures = [(layer, _tile_executor.submit(self._prepare_image_layer_tile, layer, False, plan))
+                       for layer, plan in misses]
+            for layer, future in futures:
+                tiles[id(layer)] = future.result()
+        for layer, plan in plans:
+            if id(layer) not in tiles:
+                tiles[id(layer)] = None if plan is None else self._prepare_image_layer_tile(layer, plan=plan)
+        return tiles
+    
+    def _render_image_layer(self, layer: ImageLayer):
+        """Render an image layer to canvas."""
+        self._composite_image_tile(self._prepare_image_layer_tile(layer))
+    
+    def _composite_image_tile(self, prepared: Optional[Tuple[np.ndarray, int, int]]):
+        """Draw a (tile, x, y) tuple from _prepare_image_layer_tile() onto the canvas."""
+        if prepared is None:
+            return
+        
+        img, x, y = prepared
+        h, w = img.shape
+        if self.bpp == 1:
+            self._blit_bits(x, y, img > 128)
+        else:
+            self.canvas[y:y + h, x:x + w] = img
     
     def _render_text_layer(self, layer: TextLayer):
         """Render a text layer to canvas."""
@@ -330,7 +654,6 @@ class EinkComposer:
         
         # Import text functions
         from .text import render_text, measure_text
-        from .image_ops import rotate_ccw_90, flip_horizontal
         
         # Measure text dimensions
         text_width, text_height = measure_text(layer.text, layer.font_size)
@@ -344,7 +667,8 @@ class EinkComposer:
             bg_height = text_height
         
         # Create a temporary canvas for text + background
-        temp_canvas = np.full((bg_height, bg_width), 255, dtype=np.uint8)  # White background
+        temp_canvas = self._get_scratch((bg_height, bg_width))
+        temp_canvas.fill(255)  # White background
         
         # Render background if enabled
         if layer.background:
@@ -359,54 +683,60 @@ class EinkComposer:
         # Render text on temporary canvas
         render_text(layer.text, text_x, text_y, temp_canvas, layer.color, layer.font_size)
         
-        # Apply flipping if needed
-        if layer.flip_h:
-            temp_canvas = flip_horizontal(temp_canvas)
-        if layer.flip_v:
-            temp_canvas = np.flipud(temp_canvas)  # Vertical flip using numpy
-        
-        # Apply rotation if needed
-        if layer.rotate != 0:
-            # Normalize rotation to 0, 90, 180, 270
-            rotations = (layer.rotate % 360) // 90
-            for _ in range(rotations):
-                temp_canvas = rotate_ccw_90(temp_canvas)
+        # Apply flips and rotation as a single view; compositing copies it anyway
+        if layer.flip_h or layer.flip_v or layer.rotate % 360:
+            temp_canvas = apply_orientation(temp_canvas, layer.flip_h, layer.flip_v,
+                                            layer.rotate, contiguous=False)
         
-        # Composite onto main canvas
+        # Clip to the canvas
         h, w = temp_canvas.shape
-        y_end = min(layer.y + h, self.height)
-        x_end = min(layer.x + w, self.width)
-        
-        if layer.y < self.height and layer.x < self.width:
-            # Only composite non-white pixels if no background, otherwise composite everything
-            if layer.background:
-                self.canvas[layer.y:y_end, layer.x:x_end] = temp_canvas[:y_end-layer.y, :x_end-layer.x]
-            else:
-                # For no background, only composite non-white pixels (text only)
-                mask = temp_canvas[:y_end-layer.y, :x_end-layer.x] < 255
-                self.canvas[layer.y:y_end, layer.x:x_end][mask] = temp_canvas[:y_end-layer.y, :x_end-layer.x][mask]
-    
-    def _render_rectangle_layer(self, layer: RectangleLayer):
-        """Render a rectangle layer to canvas."""
-        if not layer.visible:
-            return
-            
         x1 = max(0, layer.x)
         y1 = max(0, layer.y)
-        x2 = min(self.width, layer.x + layer.width)
-        y2 = min(self.height, layer.y + layer.height)
-        
+        x2 = min(self.width, layer.x + w)
+        y2 = min(self.height, layer.y + h)
         if x1 >= x2 or y1 >= y2:
             return
-            
-        if layer.filled:
-            self.canvas[y1:y2, x1:x2] = layer.color
+        region = temp_canvas[y1 - layer.y:y2 - layer.y, x1 - layer.x:x2 - layer.x]
+        
+        # Composite onto main canvas
+        # Only composite non-white pixels if no background, otherwise composite everything
+        if self.bpp == 1:
+            self._blit_bits(x1, y1, region > 128, None if layer.background else region < 255)
+        elif layer.background:
+            self.canvas[y1:y2, x1:x2] = region
+        else:
+            # For no background, only composite non-white pixels (text only)
+            mask = region < 255
+            self.canvas[y1:y2, x1:x2][mask] = region[mask]
+    
+    def _render_rectangle_layers(self, layers: List[RectangleLayer]):
+        """Render a run of consecutive rectangle layers to canvas in one pass."""
+        # Clip to canvas; empty rectangles are skipped when drawn
+        rects = [(max(0, l.x), max(0, l.y),
+                  min(self.width, l.x + l.width), min(self.height, l.y + l.height),
+                  l.color, l.filled)
+                 for l in layers if l.visible]
+        if not rects:
+            return
+        
+        if self.bpp == 1:
+            for x1, y1, x2, y2, color, filled in rects:
+                if x1 >= x2 or y1 >= y2:
+                    continue
+                values = np.full((y2 - y1, x2 - x1), color > 128)
+                cover = None
+                if not filled:
+                    # Draw outline
+                    cover = np.zeros(values.shape, dtype=bool)
+                    cover[[0, -1], :] = True
+                    cover[:, [0, -1]] = True
+                self._blit_bits(x1, y1, values, cover)
+        elif NUMBA_AVAILABLE:
+            draw_rectangles(self.canvas, np.array(rects, dtype=np.int32))
+        elif CV2_AVAILABLE:
+            draw_rectangles_cv2(self.canvas, rects)
         else:
-            # Draw outline
-            self.canvas[y1, x1:x2] = layer.color  # Top
-            self.canvas[y2-1, x1:x2] = layer.color  # Bottom
-            self.canvas[y1:y2, x1] = layer.color  # Left
-            self.canvas[y1:y2, x2-1] = layer.color  # Right
+            draw_rectangles(self.canvas, rects)
     
     def render(self, background_color: int = 255, 
                final_dither: Optional[Literal['floyd-steinberg', 'threshold']] = None,
@@ -420,21 +750,21 @@ class EinkComposer:
             transformations: List of transformations to apply
             
         Returns:
-            Rendered grayscale image
+            Rendered grayscale image (a read-only view of the canvas when no
+            final dither or transformations are requested)
         """
-        # Clear canvas
-        self.canvas.fill(background_color)
-        
-        # Render each layer
-        for layer in self.layers:
-            if isinstance(layer, ImageLayer):
-                self._render_image_layer(layer)
-            elif isinstance(layer, TextLayer):
-                self._render_text_layer(layer)
-            elif isinstance(layer, RectangleLayer):
-                self._render_rectangle_layer(layer)
-        
-        result = self.canvas.copy()
+        self._compose(background_color)
+        
+        if self.bpp == 1:
+            # Unpack the bit plane into a fresh grayscale frame
+            result = np.unpackbits(self.canvas, axis=1, count=self.width)
+            result *= 255
+        elif final_dither or transformations:
+            result = self.canvas.copy()
+        else:
+            # Nothing to post-process, so hand out the canvas without copying
+            result = self.canvas.view()
+            result.flags.writeable = False
         
         # Apply final dithering if requested
         if final_dither == 'floyd-steinberg':
@@ -453,10 +783,41 @@ class EinkComposer:
                 elif transform == 'rotate-90':
                     result = rotate_ccw_90(result)
                 elif transform == 'invert':
-                    result = invert_colors(result)
+                    # result is always a private copy here, so invert in place
+                    result = invert_colors(result, out=result)
         
         return result
     
+    def _compose(self, background_color: int = 255):
+        """Clear the canvas and draw every layer onto it."""
+        # Reallocate the canvas only if the dimensions changed, otherwise clear it
+        if self.canvas.shape != self._canvas_shape():
+            self.canvas = np.zeros(self._canvas_shape(), dtype=np.uint8)
+        self._clear_canvas(background_color)
+        
+        # Image tiles are prepared up front (concurrently where that helps)
+        # and composited in layer order below
+        tiles = self._prepare_image_tiles()
+        
+        # Render each layer, batching consecutive rectangles
+        pending_rects: List[RectangleLayer] = []
+        for layer in self.layers:
+            layer_type = type(layer)
+            if layer_type is RectangleLayer:
+                pending_rects.append(layer)
+                continue
+            if pending_rects:
+                self._render_rectangle_layers(pending_rects)
+                pending_rects = []
+            if layer_type is ImageLayer:
+                self._composite_image_tile(tiles[id(layer)])
+                continue
+            handler = self._dispatch.get(layer_type)
+            if handler is not None:
+                handler(layer)
+        if pending_rects:
+            self._render_rectangle_layers(pending_rects)
+    
     def render_binary(self, **kwargs) -> bytes:
         """
         Render and return as packed binary data.
@@ -464,6 +825,11 @@ class EinkComposer:
         Returns:
             Packed binary data (8 pixels per byte)
         """
+        # A 1-bit canvas is already in packed form
+        if self.bpp == 1 and not kwargs.get('final_dither') and not kwargs.get('transformations'):
+            self._compose(kwargs.get('background_color', 255))
+            return self.canvas.tobytes()
+        
         img = self.render(**kwargs)
         return pack_bits(img)
     
@@ -482,11 +848,14 @@ class EinkComposer:
                 f.write(data)
         else:
             img = self.render(**render_kwargs)
-            pil_img = Image.fromarray(img, mode='L')
             
             if format == 'bmp':
-                # Convert to 1-bit for true monochrome BMP
-                pil_img = pil_img.point(lambda x: 255 if x > 128 else 0, mode='1')
+                # Convert to 1-bit for true monochrome BMP; PIL's raw '1' layout
+                # matches pack_bits (MSB first, rows padded to whole bytes)
+                height, width = img.shape
+                pil_img = Image.frombytes('1', (width, height), pack_bits(img))
+            else:
+                pil_img = Image.fromarray(img, mode='L')
             
             pil_img.save(filename)
     
@@ -518,9 +887,9 @@ class EinkComposer:
                     'height': layer.height
                 })
                 # Include placeholder_type if it exists (for QR codes, etc.)
-                if hasattr(layer, 'placeholder_type'):
+                if layer.placeholder_type is not None:
                     layer_info['placeholder_type'] = layer.placeholder_type
-                if hasattr(layer, 'error_correction'):
+                if layer.error_correction is not None:
                     layer_info['error_correction'] = layer.error_correction
             elif isinstance(layer, TextLayer):
                 layer_info.update({
@@ -534,7 +903,7 @@ class EinkComposer:
                     'padding': layer.padding
                 })
                 # Include placeholder_type if it exists (for IP placeholders, etc.)
-                if hasattr(layer, 'placeholder_type'):
+                if layer.placeholder_type is not None:
                     layer_info['placeholder_type'] = layer.placeholder_type
             elif isinstance(layer, RectangleLayer):
                 layer_info.update({
@@ -1,42 +1,79 @@
 import numpy as np
-from typing import Union
+from typing import Optional, Union
 
+from ._jit import njit, NUMBA_AVAILABLE
 
-def floyd_steinberg_dither(image: np.ndarray) -> np.ndarray:
+
+@njit(cache=True, nogil=True)
+def _floyd_steinberg_kernel(image: np.ndarray, out: np.ndarray) -> None:
     """
-    Apply Floyd-Steinberg dithering to convert grayscale image to 1-bit monochrome.
+    Serpentine Floyd-Steinberg over uint8 input, writing 0/255 into out.
     
-    Args:
-        image: Input grayscale image as numpy array (0-255 values)
-        
-    Returns:
-        Binary image (0 or 255 values)
+    Errors are carried in two int16 row buffers (current and next row),
+    padded by one cell on each side so edge pixels need no bounds checks.
     """
-    # Ensure we're working with a float copy
-    img = image.astype(np.float32).copy()
-    height, width = img.shape
+    height, width = image.shape
+    cur_err = np.zeros(width + 2, dtype=np.int16)
+    nxt_err = np.zeros(width + 2, dtype=np.int16)
     
-    # Process each pixel
     for y in range(height):
-        for x in range(width):
-            old_pixel = img[y, x]
+        # Alternate scan direction on every row
+        if y % 2 == 0:
+            start, stop, step = 0, width, 1
+        else:
+            start, stop, step = width - 1, -1, -1
+        
+        for x in range(start, stop, step):
+            old_pixel = image[y, x] + cur_err[x + 1]
             new_pixel = 255 if old_pixel > 128 else 0
-            img[y, x] = new_pixel
+            out[y, x] = new_pixel
             
-            # Calculate and distribute error
+            # Distribute error ahead on this row and onto the next row. The
+            # 7/3/5 shares are rounded to nearest (floor division would bias
+            # every share downwards and darken the output) and the last tap
+            # takes the remainder, so the full error is carried forward
             error = old_pixel - new_pixel
-            
-            # Distribute error to neighboring pixels
-            if x + 1 < width:
-                img[y, x + 1] += error * 7 / 16
-            if y + 1 < height:
-                if x > 0:
-                    img[y + 1, x - 1] += error * 3 / 16
-                img[y + 1, x] += error * 5 / 16
-                if x + 1 < width:
-                    img[y + 1, x + 1] += error * 1 / 16
+            right = (error * 7 + 8) // 16
+            below_back = (error * 3 + 8) // 16
+            below = (error * 5 + 8) // 16
+            cur_err[x + 1 + step] += right
+            nxt_err[x + 1 - step] += below_back
+            nxt_err[x + 1] += below
+            nxt_err[x + 1 + step] += error - right - below_back - below
+        
+        cur_err, nxt_err = nxt_err, cur_err
+        nxt_err[:] = 0
+
+
+def floyd_steinberg_dither(image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Apply Floyd-Steinberg dithering to convert grayscale image to 1-bit monochrome.
     
-    return img.astype(np.uint8)
+    Args:
+        image: Input grayscale image as numpy array (0-255 values)
+        out: Optional uint8 array of the same shape to write the result into
+        
+    Returns:
+        Binary image (0 or 255 values)
+    """
+    if image.dtype != np.uint8:
+        # Clip and round first; a plain cast would truncate floats and wrap
+        # out-of-range values (300 -> 44)
+        image = np.rint(np.clip(image, 0, 255)).astype(np.uint8)
+    image = np.ascontiguousarray(image)
+    if out is None:
+        out = np.empty_like(image)
+    _floyd_steinberg_kernel(image, out)
+    return out
+
+
+# Compile the kernel up front so the first render doesn't pay for it
+if NUMBA_AVAILABLE:
+    _floyd_steinberg_kernel(np.zeros((2, 2), dtype=np.uint8), np.empty((2, 2), dtype=np.uint8))
+
+
+# Lookup table for the default threshold, indexed by pixel value
+_THRESHOLD_LUT = np.where(np.arange(256) > 128, 255, 0).astype(np.uint8)
 
 
 def threshold_dither(image: np.ndarray, threshold: int = 128) -> np.ndarray:
@@ -50,7 +87,14 @@ def threshold_dither(image: np.ndarray, threshold: int = 128) -> np.ndarray:
     Returns:
         Binary image (0 or 255 values)
     """
-    return np.where(image > threshold, 255, 0).astype(np.uint8)
+    if image.dtype != np.uint8:
+        # The lookup table only covers uint8 values; compare other dtypes directly
+        return np.where(image > threshold, 255, 0).astype(np.uint8)
+    if threshold == 128:
+        lut = _THRESHOLD_LUT
+    else:
+        lut = np.where(np.arange(256) > threshold, 255, 0).astype(np.uint8)
+    return lut[image]
 
 
 def pack_bits(image: np.ndarray) -> bytes:
@@ -64,18 +108,8 @@ def pack_bits(image: np.ndarray) -> bytes:
     Returns:
         Packed bytes
     """
-    height, width = image.shape
-    packed_width = (width + 7) // 8
-    packed = bytearray(packed_width * height)
-    
-    for y in range(height):
-        for x in range(width):
-            if image[y, x] > 128:  # White pixel
-                byte_idx = y * packed_width + x // 8
-                bit_idx = 7 - (x % 8)
-                packed[byte_idx] |= (1 << bit_idx)
-    
-    return bytes(packed)
+    # White pixels set their bit; each row is zero-padded to a whole byte
+    return np.packbits(image > 128, axis=1, bitorder='big').tobytes()
 
 
 def unpack_bits(data: bytes, width: int, height: int) -> np.ndarray:
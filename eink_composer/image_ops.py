@@ -1,7 +1,17 @@
 import numpy as np
+from functools import lru_cache
 from PIL import Image
 from typing import Tuple, Literal, Optional
 
+from ._jit import njit
+
+# Try to import OpenCV for native rectangle drawing
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
 
 def resize_image(image: np.ndarray, target_width: int, target_height: int, 
                  mode: Literal['stretch', 'fit', 'crop'] = 'fit',
@@ -104,13 +114,83 @@ def rotate_180(image: np.ndarray) -> np.ndarray:
     return np.rot90(image, k=2)
 
 
-def invert_colors(image: np.ndarray) -> np.ndarray:
-    """Invert image colors (black to white, white to black)."""
-    return 255 - image
+def apply_orientation(image: np.ndarray, flip_h: bool = False, flip_v: bool = False,
+                      rotate: int = 0, contiguous: bool = True) -> np.ndarray:
+    """
+    Apply flips followed by a counter-clockwise rotation in a single copy.
+    
+    Flips and rotation are combined as strided views and materialized once.
+    
+    Args:
+        image: Input image
+        flip_h: Horizontal flip
+        flip_v: Vertical flip
+        rotate: Counter-clockwise rotation in degrees (multiples of 90)
+        contiguous: Materialize the result (False returns the strided view)
+        
+    Returns:
+        Oriented image
+    """
+    view = image[::-1 if flip_v else 1, ::-1 if flip_h else 1]
+    
+    # Normalize rotation to 0, 90, 180, 270
+    rotations = (rotate % 360) // 90
+    if rotations:
+        view = np.rot90(view, k=rotations)
+    
+    return np.ascontiguousarray(view) if contiguous else view
+
+
+@njit(cache=True, nogil=True)
+def draw_rectangles(canvas: np.ndarray, rects: np.ndarray) -> None:
+    """
+    Draw a batch of rectangles onto the canvas in-place, in order.
+    
+    Args:
+        canvas: Grayscale canvas to draw on
+        rects: Rows of clipped (x1, y1, x2, y2, color, filled); an (N, 6)
+            int32 array when running under Numba
+    """
+    for x1, y1, x2, y2, color, filled in rects:
+        if x1 >= x2 or y1 >= y2:
+            continue
+        
+        if filled:
+            canvas[y1:y2, x1:x2] = color
+        else:
+            # Draw outline
+            canvas[y1, x1:x2] = color  # Top
+            canvas[y2-1, x1:x2] = color  # Bottom
+            canvas[y1:y2, x1] = color  # Left
+            canvas[y1:y2, x2-1] = color  # Right
+
+
+def draw_rectangles_cv2(canvas: np.ndarray, rects) -> None:
+    """
+    Draw a batch of rectangles with OpenCV, one native call per rectangle.
+    
+    Args:
+        canvas: Grayscale canvas to draw on
+        rects: Rows of clipped (x1, y1, x2, y2, color, filled)
+    """
+    for x1, y1, x2, y2, color, filled in rects:
+        if x1 >= x2 or y1 >= y2:
+            continue
+        cv2.rectangle(canvas, (x1, y1), (x2 - 1, y2 - 1), int(color),
+                      cv2.FILLED if filled else 1)
+
+
+def invert_colors(image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Invert image colors (black to white, white to black); pass out=image to invert in place."""
+    if image.dtype != np.uint8:
+        # XOR only inverts uint8 values; subtract for other dtypes
+        return np.subtract(255, image, out=out)
+    return np.bitwise_xor(image, np.uint8(0xFF), out=out)
 
 
 def adjust_brightness_contrast(image: np.ndarray, brightness: float = 1.0, 
-                             contrast: float = 1.0) -> np.ndarray:
+                             contrast: float = 1.0,
+                             out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Adjust image brightness and contrast.
     
@@ -118,20 +198,41 @@ def adjust_brightness_contrast(image: np.ndarray, brightness: float = 1.0,
         image: Input grayscale image
         brightness: Brightness multiplier (1.0 = no change, >1 = brighter, <1 = darker)
         contrast: Contrast adjustment (-100 to 100, 0 = no change)
+        out: Optional uint8 array of the same shape to write the result into
         
     Returns:
         Adjusted image
     """
+    if image.dtype != np.uint8:
+        # The lookup table only covers uint8 values; compute other dtypes directly
+        result = _brightness_contrast_u8(image.astype(np.float32), brightness, contrast)
+        if out is None:
+            return result
+        out[...] = result
+        return out
+    return np.take(_brightness_contrast_lut(brightness, contrast), image, out=out)
+
+
+def _brightness_contrast_u8(values: np.ndarray, brightness: float, contrast: float) -> np.ndarray:
+    """Apply brightness and contrast to float values and clip them to uint8."""
     # Apply brightness
-    img = image.astype(np.float32) * brightness
+    values = values * brightness
     
     # Apply contrast
     if contrast != 0:
         factor = (259 * (contrast + 255)) / (255 * (259 - contrast))
-        img = 128 + factor * (img - 128)
+        values = 128 + factor * (values - 128)
     
     # Clip to valid range
-    return np.clip(img, 0, 255).astype(np.uint8)
+    return np.clip(values, 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=32)
+def _brightness_contrast_lut(brightness: float, contrast: float) -> np.ndarray:
+    """Build a 256-entry lookup table for a brightness/contrast pair."""
+    lut = _brightness_contrast_u8(np.arange(256, dtype=np.float32), brightness, contrast)
+    lut.flags.writeable = False
+    return lut
 
 
 def crop_image(image: np.ndarray, x: int, y: int, width: int, height: int) -> np.ndarray:
@@ -156,4 +257,33 @@ def crop_image(image: np.ndarray, x: int, y: int, width: int, height: int) -> np
     x2 = min(x + width, img_w)
     y2 = min(y + height, img_h)
     
-    return image[y:y2, x:x2]
\ No newline at end of file
+    return image[y:y2, x:x2]
+
+
+@lru_cache(maxsize=32)
+def make_qr_placeholder(width: int, height: int) -> np.ndarray:
+    """
+    Build the preview pattern shown in place of a template QR code.
+    
+    A white tile with a 2px black border and a solid block in the center.
+    Placeholders of the same size are identical, so the result is cached
+    and returned read-only.
+    
+    Args:
+        width: Placeholder width
+        height: Placeholder height
+        
+    Returns:
+        uint8 placeholder image containing only 0/255
+    """
+    # Black tile with a white interior leaves the 2px border
+    img = np.zeros((height, width), dtype=np.uint8)
+    img[2:-2, 2:-2] = 255
+    
+    # "QR" block in the center, only if big enough
+    if height > 10 and width > 20:
+        center_y, center_x = height // 2, width // 2
+        img[center_y-5:center_y+5, center_x-10:center_x+10] = 0
+    
+    img.flags.writeable = False
+    return img
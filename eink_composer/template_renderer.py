@@ -7,13 +7,56 @@ Renders templates with dynamic data using the EinkComposer for proven compatibil
 import json
 import os
 import tempfile
+from functools import lru_cache
 from typing import Optional
 import qrcode
+import numpy as np
 from PIL import Image
 
 from . import EinkComposer
 
 
+@lru_cache(maxsize=32)
+def _generate_qr_code(data: str, size: tuple, error_correction: str = 'M') -> np.ndarray:
+    """
+    Generate QR code as a grayscale array for use with EinkComposer.
+    
+    Results are cached, so the returned array is read-only and shared.
+    
+    Args:
+        data: Data to encode in QR code
+        size: (width, height) tuple for QR code size
+        error_correction: Error correction level (L, M, Q, H)
+        
+    Returns:
+        QR code image as uint8 numpy array
+    """
+    # Map error correction levels
+    correction_map = {
+        'L': qrcode.constants.ERROR_CORRECT_L,
+        'M': qrcode.constants.ERROR_CORRECT_M, 
+        'Q': qrcode.constants.ERROR_CORRECT_Q,
+        'H': qrcode.constants.ERROR_CORRECT_H
+    }
+    
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=correction_map.get(error_correction, qrcode.constants.ERROR_CORRECT_M),
+        box_size=max(1, min(size) // 25),  # Adjust box size based on target size
+        border=1,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    # Generate PIL image and convert to grayscale array
+    pil_img = qr.make_image(fill_color="black", back_color="white")
+    pil_img = pil_img.resize(size, Image.NEAREST).convert('L')
+    
+    qr_img = np.array(pil_img)
+    qr_img.flags.writeable = False
+    return qr_img
+
+
 class TemplateRenderer:
     """Renders templates with dynamic data using EinkComposer for proven compatibility."""
     
@@ -35,43 +78,6 @@ class TemplateRenderer:
         except Exception as e:
             raise Exception(f"Failed to load template {self.template_path}: {e}")
     
-    def _generate_qr_code_file(self, data: str, output_path: str, size: tuple, error_correction: str = 'M') -> str:
-        """
-        Generate QR code and save to file for use with EinkComposer.
-        
-        Args:
-            data: Data to encode in QR code
-            output_path: Path to save QR code image
-            size: (width, height) tuple for QR code size
-            error_correction: Error correction level (L, M, Q, H)
-            
-        Returns:
-            Path to saved QR code file
-        """
-        # Map error correction levels
-        correction_map = {
-            'L': qrcode.constants.ERROR_CORRECT_L,
-            'M': qrcode.constants.ERROR_CORRECT_M, 
-            'Q': qrcode.constants.ERROR_CORRECT_Q,
-            'H': qrcode.constants.ERROR_CORRECT_H
-        }
-        
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=correction_map.get(error_correction, qrcode.constants.ERROR_CORRECT_M),
-            box_size=max(1, min(size) // 25),  # Adjust box size based on target size
-            border=1,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        # Generate and save PIL image
-        pil_img = qr.make_image(fill_color="black", back_color="white")
-        pil_img = pil_img.resize(size, Image.NEAREST)
-        pil_img.save(output_path)
-        
-        return output_path
-    
     def render(self, ip_address: str, tunnel_url: str) -> EinkComposer:
         """
         Render template with dynamic data using EinkComposer.
@@ -122,31 +128,23 @@ class TemplateRenderer:
     
     def _add_qr_layer(self, composer: EinkComposer, layer_data: dict, tunnel_url: str):
         """Add QR code layer using EinkComposer."""
-        # Generate QR code to temporary file
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-            temp_path = temp_file.name
-            
         width = layer_data.get('width', 70)
         height = layer_data.get('height', 70)
         error_correction = layer_data.get('error_correction', 'M')
         
-        # Generate QR code file
-        self._generate_qr_code_file(tunnel_url, temp_path, (width, height), error_correction)
+        # Generate QR code in memory
+        qr_img = _generate_qr_code(tunnel_url, (width, height), error_correction)
         
         # Add as image layer to composer
-        composer.add_image_layer(
+        composer.add_image_layer_from_array(
             layer_id=layer_data['id'],
-            image_path=temp_path,
+            image_data=qr_img,
             x=layer_data.get('x', 0),
             y=layer_data.get('y', 0),
             width=width,
-            height=height
+            height=height,
+            already_binary=True
         )
-        
-        # Store temp file for cleanup
-        if not hasattr(composer, '_temp_files'):
-            composer._temp_files = []
-        composer._temp_files.append(temp_path)
     
     def _add_regular_layer(self, composer: EinkComposer, layer_data: dict):
         """Add regular (non-placeholder) layer using EinkComposer."""
@@ -202,16 +200,6 @@ class TemplateRenderer:
                 height=layer_data.get('height')
             )
     
-    def _cleanup_temp_files(self, composer: EinkComposer):
-        """Clean up temporary files created during rendering."""
-        if hasattr(composer, '_temp_files'):
-            for temp_file in composer._temp_files:
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            composer._temp_files.clear()
-    
     def render_and_save(self, ip_address: str, tunnel_url: str, output_path: str) -> str:
         """
         Render template and save to file.
@@ -226,7 +214,6 @@ class TemplateRenderer:
         """
         composer = self.render(ip_address, tunnel_url)
         composer.save(output_path, format='png')
-        self._cleanup_temp_files(composer)
         return output_path
     
     def render_and_display(self, ip_address: str, tunnel_url: str):
@@ -290,8 +277,6 @@ class TemplateRenderer:
                     os.remove(temp_path)
                 except OSError:
                     pass
-            if composer:
-                self._cleanup_temp_files(composer)
             display.close()
 
 
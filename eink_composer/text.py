@@ -91,7 +91,8 @@ def render_text(text: str, x: int = 0, y: int = 0,
     
     canvas_h, canvas_w = canvas.shape
     
-    for i, char in enumerate(text):
+    # The font only has uppercase glyphs, so lowercase renders as uppercase
+    for i, char in enumerate(text.upper()):
         if char not in FONT_6X8:
             char = ' '  # Default to space for unknown characters
             
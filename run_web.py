@@ -6,53 +6,102 @@ Handles environment setup and starts the Flask server
 
 import sys
 import os
-from pathlib import Path
-
-# Add current directory to Python path
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
-
-# Add SDK path if available
-sdk_path = '/opt/distiller-cm5-sdk'
-if os.path.exists(sdk_path):
-    sys.path.insert(0, sdk_path)
-    print("✓ SDK path added")
-else:
-    print("⚠ SDK not found - hardware features will be disabled")
-
-# Check for required dependencies
-try:
-    import flask
-    print("✓ Flask available")
-except ImportError:
-    print("❌ Flask not found. Install with: pip install flask")
-    sys.exit(1)
-
-try:
-    from eink_composer import EinkComposer
-    print("✓ E-ink composer available")
-except ImportError:
-    print("❌ E-ink composer not found. Make sure you're in the correct directory.")
-    sys.exit(1)
-
-# Create required directories
-os.makedirs(current_dir / 'templates', exist_ok=True)
-os.makedirs(current_dir / 'static', exist_ok=True)
-
-print("\n" + "="*50)
-print("🖥️  E-ink Web UI Starting...")
-print("="*50)
-print(f"📁 Working directory: {current_dir}")
-print(f"🌐 Access URL: http://localhost:5000")
-print(f"🌐 Network access: http://0.0.0.0:5000")
-print("="*50 + "\n")
-
-# Import and run the web app
-try:
-    from web_app import app
-    app.run(host='0.0.0.0', port=5000, debug=False)
-except KeyboardInterrupt:
-    print("\n👋 E-ink Web UI stopped")
-except Exception as e:
-    print(f"❌ Error starting web UI: {e}")
-    sys.exit(1)
\ No newline at end of file
+import importlib.util
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# (module, display name, install hint) checked before the app is imported
+REQUIRED_MODULES = (
+    ('flask', 'Flask', 'Install with: pip install eink-composer[web]'),
+    ('eink_composer', 'E-ink composer', "Make sure you're in the correct directory."),
+)
+
+
+def main():
+    """Set up the environment and serve the web UI."""
+    # Add current directory to Python path
+    sys.path.insert(0, current_dir)
+
+    # Startup messages are collected and written in one go below
+    startup_lines = []
+
+    # Add SDK path if available (set DISTILLER_SDK=0 to skip the probe entirely).
+    # It goes at the end of sys.path so first-party imports are found first.
+    sdk_path = '/opt/distiller-cm5-sdk'
+    if os.environ.get('DISTILLER_SDK', '1') == '1':
+        try:
+            os.stat(sdk_path)
+            sys.path.append(sdk_path)
+            startup_lines.append("[ok] SDK path added")
+        except OSError:
+            startup_lines.append("[warn] SDK not found - hardware features will be disabled")
+    else:
+        startup_lines.append("[info] SDK probe disabled (DISTILLER_SDK=0)")
+
+    # Check for required dependencies without importing them; web_app does the real import
+    for name, label, hint in REQUIRED_MODULES:
+        if name not in sys.modules and importlib.util.find_spec(name) is None:
+            sys.stderr.write(f"Error: {label} not found. {hint}\n")
+            sys.exit(1)
+        startup_lines.append(f"[ok] {label} available")
+
+    # Create required directories (one stat when they already exist)
+    for name in ('templates', 'static'):
+        path = os.path.join(current_dir, name)
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+
+    # Set QUIET=1 to skip the banner on headless deployments
+    if not os.environ.get('QUIET'):
+        startup_lines += [
+            "",
+            "=" * 50,
+            "E-ink Web UI Starting...",
+            "=" * 50,
+            f"Working directory: {current_dir}",
+            "Access URL: http://localhost:5000",
+            "Network access: http://0.0.0.0:5000",
+            "=" * 50,
+            "",
+        ]
+        sys.stdout.write("\n".join(startup_lines) + "\n")
+        sys.stdout.flush()
+
+    # Prefer a production server over the Flask dev server: Waitress serves the
+    # WSGI app directly, Uvicorn drives it through asgiref's ASGI adapter.
+    # Only the server that is actually used gets imported.
+    waitress_available = importlib.util.find_spec('waitress') is not None
+    uvicorn_available = (importlib.util.find_spec('uvicorn') is not None
+                         and importlib.util.find_spec('asgiref') is not None)
+
+    # Size of the request thread pool (Waitress only)
+    web_threads = int(os.environ.get('WEB_THREADS', 8))
+
+    # Import and run the web app
+    try:
+        from web_app import app
+        # Keep compiled Jinja templates across restarts; entries are
+        # invalidated automatically when a template's source changes
+        from jinja2 import FileSystemBytecodeCache
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+        if waitress_available:
+            import waitress
+            waitress.serve(app, host='0.0.0.0', port=5000, threads=web_threads)
+        elif uvicorn_available:
+            import uvicorn
+            from asgiref.wsgi import WsgiToAsgi
+            # uvloop/httptools are picked up automatically when installed
+            uvicorn.run(WsgiToAsgi(app), host='0.0.0.0', port=5000, workers=1)
+        else:
+            print("[warn] No production server found - using Flask dev server (pip install eink-composer[web])")
+            app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+    except KeyboardInterrupt:
+        print("\nE-ink Web UI stopped")
+    except Exception as e:
+        print(f"Error starting web UI: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
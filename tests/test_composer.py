@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from eink_composer import composer as composer_module
+from eink_composer.composer import EinkComposer
+
+
+def make_images(tmp_path, count):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"img{i}.png"
+        Image.fromarray(rng.integers(0, 256, (60, 90), dtype=np.uint8)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def build(paths):
+    composer = EinkComposer(250, 128)
+    for i, path in enumerate(paths):
+        composer.add_image_layer(f"img{i}", path, x=i * 60, width=80, height=100, brightness=1.1)
+    composer.add_rectangle_layer("rect", x=5, y=5, width=20, height=20)
+    return composer
+
+
+def test_concurrent_tiles_match_single_layer_renders(tmp_path):
+    paths = make_images(tmp_path, 3)
+    result = build(paths).render().copy()
+    
+    # Composite the same layers one at a time as the reference
+    reference = EinkComposer(250, 128)
+    for i, path in enumerate(paths):
+        reference.add_image_layer(f"img{i}", path, x=i * 60, width=80, height=100, brightness=1.1)
+        reference.render()
+    reference.add_rectangle_layer("rect", x=5, y=5, width=20, height=20)
+    assert np.array_equal(result, reference.render())
+
+
+def test_source_files_are_stat_once_per_render(tmp_path, monkeypatch):
+    paths = make_images(tmp_path, 3)
+    composer = build(paths)
+    composer.render()
+    
+    calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(composer_module.os, "stat",
+                        lambda path, *a, **k: (calls.append(path), real_stat(path, *a, **k))[1])
+    composer.render()
+    assert sorted(calls) == sorted(paths)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from eink_composer.dithering import floyd_steinberg_dither
+
+
+def reference_floyd_steinberg(image: np.ndarray) -> np.ndarray:
+    """Plain float Floyd-Steinberg (left-to-right scan), used as the tone baseline."""
+    img = image.astype(np.float32)
+    height, width = img.shape
+    for y in range(height):
+        for x in range(width):
+            old_pixel = img[y, x]
+            new_pixel = 255 if old_pixel > 128 else 0
+            img[y, x] = new_pixel
+            error = old_pixel - new_pixel
+            if x + 1 < width:
+                img[y, x + 1] += error * 7 / 16
+            if y + 1 < height:
+                if x > 0:
+                    img[y + 1, x - 1] += error * 3 / 16
+                img[y + 1, x] += error * 5 / 16
+                if x + 1 < width:
+                    img[y + 1, x + 1] += error * 1 / 16
+    return img.astype(np.uint8)
+
+
+@pytest.mark.parametrize("level", [16, 64, 128, 200, 240])
+def test_flat_gray_keeps_mean_tone(level):
+    image = np.full((64, 64), level, dtype=np.uint8)
+    result = floyd_steinberg_dither(image)
+    assert set(np.unique(result)) <= {0, 255}
+    assert abs(result.mean() - reference_floyd_steinberg(image).mean()) < 1.0
+
+
+def test_ramp_keeps_mean_tone():
+    image = np.tile(np.linspace(0, 255, 256).astype(np.uint8), (64, 1))
+    result = floyd_steinberg_dither(image)
+    assert abs(result.mean() - reference_floyd_steinberg(image).mean()) < 1.0
+    assert abs(result.mean() - image.mean()) < 1.0
+
+
+def test_float_and_out_of_range_input_is_clipped():
+    bright = np.array([[255.9, 300.0], [1000.0, 255.0]])
+    assert (floyd_steinberg_dither(bright) == 255).all()
+    dark = np.array([[-5.0, -300.0], [0.4, 0.0]])
+    assert (floyd_steinberg_dither(dark) == 0).all()
+    wide = np.full((8, 8), 300, dtype=np.int16)
+    assert (floyd_steinberg_dither(wide) == 255).all()
+
+
+def test_float_input_is_rounded():
+    image = np.full((32, 32), 127.6)
+    expected = floyd_steinberg_dither(np.full((32, 32), 128, dtype=np.uint8))
+    assert np.array_equal(floyd_steinberg_dither(image), expected)
+
+
+def test_threshold_dither_accepts_float_input():
+    from eink_composer.dithering import threshold_dither
+    image = np.array([[0.0, 128.0, 128.5, 300.0]], dtype=np.float32)
+    result = threshold_dither(image)
+    assert result.dtype == np.uint8
+    assert result.tolist() == [[0, 0, 255, 255]]
+
+
+def test_threshold_dither_uint8_matches_comparison():
+    from eink_composer.dithering import threshold_dither
+    image = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    for threshold in (64, 128):
+        expected = np.where(image > threshold, 255, 0).astype(np.uint8)
+        assert np.array_equal(threshold_dither(image, threshold), expected)
@@ -0,0 +1,46 @@
+import numpy as np
+
+from eink_composer.image_ops import adjust_brightness_contrast, invert_colors
+
+
+def reference_brightness_contrast(image, brightness, contrast):
+    """Direct float computation, used as the baseline for the lookup table."""
+    img = image.astype(np.float32) * brightness
+    if contrast != 0:
+        factor = (259 * (contrast + 255)) / (255 * (259 - contrast))
+        img = 128 + factor * (img - 128)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def test_uint8_matches_reference():
+    image = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    for brightness, contrast in ((1.0, 0), (1.3, 0), (0.7, 40), (1.0, -50)):
+        expected = reference_brightness_contrast(image, brightness, contrast)
+        assert np.array_equal(adjust_brightness_contrast(image, brightness, contrast), expected)
+
+
+def test_accepts_float_input():
+    image = np.array([[0.0, 100.5, 255.0, 400.0]], dtype=np.float64)
+    result = adjust_brightness_contrast(image, 0.5, 20)
+    assert result.dtype == np.uint8
+    assert np.array_equal(result, reference_brightness_contrast(image, 0.5, 20))
+
+
+def test_float_input_with_out():
+    image = np.full((2, 3), 300.0)
+    out = np.empty((2, 3), dtype=np.uint8)
+    assert adjust_brightness_contrast(image, 0.5, 0, out=out) is out
+    assert (out == 150).all()
+
+
+def test_invert_uint8_in_place():
+    image = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    expected = 255 - image
+    assert invert_colors(image, out=image) is image
+    assert np.array_equal(image, expected)
+
+
+def test_invert_accepts_float_input():
+    image = np.array([[0.0, 100.5, 255.0]], dtype=np.float32)
+    result = invert_colors(image)
+    assert np.array_equal(result, 255 - image)
@@ -0,0 +1,83 @@
+import pytest
+
+flask = pytest.importorskip("flask")
+
+import web_app
+
+
+@pytest.fixture
+def client():
+    return web_app.app.test_client()
+
+
+def session_cookie(client):
+    return client.get_cookie("session").value
+
+
+def test_session_cookie_is_signed(client):
+    client.get("/api/layers")
+    sid, _, signature = session_cookie(client).partition(".")
+    assert len(sid) == 32 and signature
+
+
+def test_unsigned_or_forged_session_id_is_replaced(client):
+    client.post("/api/add-text", json={"text": "hi", "x": 1, "y": 2})
+    sid = session_cookie(client).partition(".")[0]
+    
+    for forged in (sid, sid + ".AAAA"):
+        other = web_app.app.test_client()
+        other.set_cookie("session", forged)
+        assert other.get("/api/layers").json == []
+        assert session_cookie(other).partition(".")[0] != sid
+
+
+def test_preview_racing_a_change_does_not_keep_stale_layers(client, monkeypatch):
+    client.post("/api/add-text", json={"text": "one", "x": 1, "y": 2})
+    composer = web_app.compositions[session_cookie(client).partition(".")[0]]
+    before = client.get("/api/preview").json["image"]
+    
+    # A preview computes layer info from the old layers, and a change lands
+    # (and finishes) before that info is stored
+    real_get_layer_info = type(composer).get_layer_info
+    
+    def racing_get_layer_info(self):
+        info = real_get_layer_info(self)
+        monkeypatch.setattr(type(composer), "get_layer_info", real_get_layer_info)
+        assert client.post("/api/add-text", json={"text": "two", "x": 1, "y": 40}).status_code == 200
+        return info
+    
+    composer.mark_changed()
+    monkeypatch.setattr(type(composer), "get_layer_info", racing_get_layer_info)
+    client.get("/api/preview")
+    
+    assert [layer["text"] for layer in client.get("/api/layers").json] == ["one", "two"]
+    assert client.get("/api/preview").json["image"] != before
+
+
+def test_load_template_invalidates_layer_info(client):
+    client.post("/api/add-text", json={"text": "old", "x": 1, "y": 2})
+    assert len(client.get("/api/layers").json) == 1
+    
+    template = {"width": 250, "height": 128,
+                "layers": [{"type": "rectangle", "id": "r1", "x": 0, "y": 0, "width": 5, "height": 5}]}
+    response = client.post("/api/load-template", json={"template": template})
+    assert response.status_code == 200, response.json
+    assert [layer["id"] for layer in client.get("/api/layers").json] == ["r1"]
+
+
+def test_spilled_sessions_live_in_instance_folder_under_issued_ids(tmp_path, monkeypatch):
+    assert web_app.SESSIONS_DIR.startswith(web_app.app.instance_path)
+    monkeypatch.setattr(web_app, "SESSIONS_DIR", str(tmp_path))
+    
+    for bad in ("../secret_key", "abc", "A" * 32, "0" * 31 + "-", "0" * 33, None):
+        assert web_app._spill_path(bad) is None
+    
+    composer = web_app.EinkComposer(250, 128)
+    composer.add_rectangle_layer("r1", 0, 0, 5, 5)
+    sid = "0123456789abcdef" * 2
+    web_app._spill_composition(sid, composer)
+    assert (tmp_path / f"{sid}.pkl").stat().st_mode & 0o077 == 0
+    
+    restored = web_app._load_spilled_composition(sid)
+    assert [layer.id for layer in restored.layers] == ["r1"]
+    assert not (tmp_path / f"{sid}.pkl").exists()
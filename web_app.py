@@ -4,14 +4,35 @@ Minimalist Web UI for E-ink Display Editing
 Flask-based web application for the Distiller CM5 platform.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, render_template, request, jsonify, send_file, session, g
+from flask.json.provider import DefaultJSONProvider
+from flask.sessions import SecureCookieSession, SessionInterface
+from werkzeug.exceptions import HTTPException
+from itsdangerous import BadSignature, Signer
 import os
 import sys
 import json
 import uuid
-import base64
 import time
+import atexit
+import queue
+import shutil
+import socket
+import threading
+import struct
+import zlib
+import functools
+import hashlib
+import itertools
+import logging
+import mmap
+import pickle
+import re
+import tempfile
+import weakref
 from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import numpy as np
 from pathlib import Path
@@ -20,6 +41,20 @@ from pathlib import Path
 sys.path.insert(0, '/opt/distiller-cm5-sdk/src')
 
 from eink_composer import EinkComposer
+from eink_composer.image_ops import make_qr_placeholder
+
+# Try to use pybase64's SIMD encoder for preview images
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+# Try to use orjson for faster JSON encoding/decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Try to import hardware display support
 try:
@@ -29,7 +64,137 @@ except ImportError:
     HARDWARE_AVAILABLE = False
 
 app = Flask(__name__)
-app.secret_key = 'eink-ui-secret-key'
+
+def _load_secret_key():
+    """Secret key from EINK_SECRET_KEY, else a random key kept in the instance folder."""
+    key = os.environ.get('EINK_SECRET_KEY')
+    if key:
+        return key
+    path = os.path.join(app.instance_path, 'secret_key')
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    key = os.urandom(32)
+    os.makedirs(app.instance_path, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another process created it first
+        with open(path, 'rb') as f:
+            return f.read()
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+# Signs the session cookie; a fixed key in the source would let anyone forge it
+app.secret_key = _load_secret_key()
+
+class SessionIdInterface(SessionInterface):
+    """Session whose cookie is just the session id, signed with the secret key.
+    
+    All per-session state (the composition) lives server-side, keyed by
+    session['session_id'], which is the only key the UI stores. Signing the
+    bare id keeps clients from choosing or guessing another session's id,
+    while skipping the JSON and base64 work of Flask's cookie session.
+    """
+    
+    salt = 'session-id'
+    
+    def get_signer(self, app):
+        return Signer(app.secret_key, salt=self.salt, key_derivation='hmac', digest_method=hashlib.sha256)
+    
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self.get_signer(app).unsign(cookie).decode('ascii')
+            except (BadSignature, UnicodeDecodeError):
+                sid = ''
+            if re.fullmatch(r'[0-9a-f]{32}', sid):
+                return SecureCookieSession({'session_id': sid})
+        return SecureCookieSession()
+    
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.accessed:
+            response.vary.add('Cookie')
+        if not session:
+            if session.modified:
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        if session.modified:
+            value = self.get_signer(app).sign(session['session_id']).decode('ascii')
+            response.set_cookie(name, value,
+                                expires=self.get_expiration_time(app, session),
+                                domain=domain, path=path,
+                                httponly=self.get_cookie_httponly(app),
+                                secure=self.get_cookie_secure(app),
+                                samesite=self.get_cookie_samesite(app))
+
+app.session_interface = SessionIdInterface()
+
+if ORJSON_AVAILABLE:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson (used by jsonify and request.json)."""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = OrjsonProvider(app)
+
+# Pre-serialized body for unexpected errors outside debug mode
+INTERNAL_ERROR_BODY = b'{"error":"Internal server error"}'
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Log an unhandled exception and answer with a JSON error.
+    
+    HTTP errors (404, 405, ...) keep their normal responses; the exception
+    text is only sent to the client in debug mode.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    app.logger.exception("Unhandled error on %s", request.path)
+    if app.debug:
+        return jsonify({'error': str(e)}), 500
+    return app.response_class(INTERNAL_ERROR_BODY, status=500, mimetype='application/json')
+
+def write_json_file(path, data, pretty=False):
+    """Write data to a file as compact JSON, or indented if pretty is set."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if pretty else 0)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(path, 'w') as f:
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+
+# Files at least this large are parsed straight from a memory map
+MMAP_JSON_MIN_SIZE = 4096
+
+def read_json_file(path):
+    """Read a JSON file.
+    
+    With orjson, larger files are parsed from an mmap instead of being read
+    into an intermediate bytes object first.
+    """
+    with open(path, 'rb') as f:
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= MMAP_JSON_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
 # Serve templates directory as static files
 from flask import send_from_directory
@@ -39,28 +204,356 @@ def serve_template_files(filename):
     """Serve template package files."""
     return send_from_directory('templates', filename)
 
-# Global storage for compositions (in production, use a database)
-compositions = {}
+# Global storage for compositions (in production, use a database), least
+# recently used first; beyond MAX_COMPOSITIONS the oldest sessions are
+# pickled to SESSIONS_DIR so idle sessions do not pin their image data in
+# memory, and are loaded back when the browser returns. Spilled sessions
+# are kept for at most SESSIONS_MAX_AGE seconds and SESSIONS_MAX_FILES files.
+# The directory lives in the private instance folder: its files are unpickled
+MAX_COMPOSITIONS = 32
+SESSIONS_DIR = os.path.join(app.instance_path, 'sessions')
+SESSIONS_MAX_FILES = 256
+SESSIONS_MAX_AGE = 7 * 24 * 3600
+compositions = OrderedDict()
+compositions_lock = threading.Lock()
+
+# Evicted compositions whose spill file is still being written:
+# session id -> (composer, token); a returning session takes it back from here
+spilling = {}
+
+@app.before_request
+def _ensure_session_id():
+    """Give each browser session an id once; later requests only read it."""
+    if 'session_id' not in session:
+        session['session_id'] = uuid.uuid4().hex
+
+def _session_id():
+    """Get the current session id."""
+    return session['session_id']
+
+def _spill_path(session_id):
+    """Path of a session's spilled composition, or None unless the id is one we issue."""
+    if not isinstance(session_id, str) or not re.fullmatch(r'[0-9a-f]{32}', session_id):
+        return None
+    return os.path.join(SESSIONS_DIR, f"{session_id}.pkl")
+
+def _spill_composition(session_id, composer):
+    """Pickle an evicted composition to disk (failures only lose that session)."""
+    path = _spill_path(session_id)
+    if path is None:
+        return
+    try:
+        # Snapshot under the render lock so a render in progress is not
+        # pickled half-way; the file is written after releasing it
+        with _render_lock(composer):
+            data = pickle.dumps(composer, protocol=pickle.HIGHEST_PROTOCOL)
+        os.makedirs(SESSIONS_DIR, mode=0o700, exist_ok=True)
+        with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+            f.write(data)
+    except Exception as e:
+        app.logger.warning("Could not spill session %s: %s", session_id, e)
+
+def _load_spilled_composition(session_id):
+    """Load and remove a session's spilled composition, or None if there is none."""
+    path = _spill_path(session_id)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            composer = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        app.logger.warning("Could not load spilled session %s: %s", session_id, e)
+        composer = None
+    _drop_spilled_composition(session_id)
+    return composer
+
+def _drop_spilled_composition(session_id):
+    """Delete a session's spilled composition, if any."""
+    path = _spill_path(session_id)
+    if path is not None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _prune_spilled_compositions():
+    """Delete spilled sessions older than SESSIONS_MAX_AGE, then the oldest beyond SESSIONS_MAX_FILES."""
+    try:
+        with os.scandir(SESSIONS_DIR) as it:
+            files = [(entry.stat().st_mtime, entry.path) for entry in it
+                     if entry.name.endswith('.pkl')]
+    except OSError:
+        return
+    files.sort(reverse=True)
+    cutoff = time.time() - SESSIONS_MAX_AGE
+    for index, (mtime, path) in enumerate(files):
+        if index >= SESSIONS_MAX_FILES or mtime < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _store_composition(session_id, composer):
+    """Store a composition as most recently used (call with compositions_lock held).
+    
+    Returns the evicted (session id, composer, token) entries; pass them to
+    _spill_evicted() once the lock is released.
+    """
+    compositions[session_id] = composer
+    compositions.move_to_end(session_id)
+    evicted = []
+    while len(compositions) > MAX_COMPOSITIONS:
+        old_id, old_composer = compositions.popitem(last=False)
+        token = object()
+        spilling[old_id] = (old_composer, token)
+        evicted.append((old_id, old_composer, token))
+    return evicted
+
+def _spill_evicted(evicted):
+    """Write evicted compositions to disk (call without compositions_lock held)."""
+    for session_id, composer, token in evicted:
+        _spill_composition(session_id, composer)
+        with compositions_lock:
+            pending = spilling.get(session_id)
+            reclaimed = pending is None or pending[1] is not token
+            if not reclaimed:
+                del spilling[session_id]
+        if reclaimed:
+            # The session came back while its file was written; the file is stale
+            _drop_spilled_composition(session_id)
+    if evicted:
+        _prune_spilled_compositions()
 
 def get_composition():
     """Get or create current composition."""
-    session_id = session.get('session_id')
-    if not session_id:
-        session_id = str(uuid.uuid4())
-        session['session_id'] = session_id
+    session_id = _session_id()
+    with compositions_lock:
+        composer = compositions.get(session_id)
+        if composer is not None:
+            compositions.move_to_end(session_id)
+            g.composer = composer
+            return composer
+        pending = spilling.pop(session_id, None)
+        if pending is not None:
+            evicted = _store_composition(session_id, pending[0])
+            composer = pending[0]
+    
+    if pending is None:
+        # Unpickle outside the lock, then keep whichever composition got stored first
+        loaded = _load_spilled_composition(session_id)
+        with compositions_lock:
+            composer = compositions.get(session_id)
+            if composer is None:
+                composer = loaded if loaded is not None else EinkComposer(250, 128)
+                evicted = _store_composition(session_id, composer)
+            else:
+                evicted = []
+    _spill_evicted(evicted)
+    g.composer = composer
+    return composer
+
+def set_composition(composer):
+    """Replace the current session's composition."""
+    session_id = _session_id()
+    g.composer = composer
+    with compositions_lock:
+        spilling.pop(session_id, None)
+        evicted = _store_composition(session_id, composer)
+    _spill_evicted(evicted)
+
+# PNG hand-off file for the display SDK; on tmpfs when available to avoid disk I/O
+DISPLAY_PNG_PATH = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                                'web_eink_display.png')
+
+# Local IP address probe result, reused for IP_CACHE_SECONDS
+IP_CACHE_SECONDS = 60
+_ip_cache = {'ip': None, 'time': None}
+
+def get_local_ip():
+    """Get the local IP address used for outbound traffic, or None if unknown.
+    
+    Connecting a UDP socket sends no packets; it only selects the route.
+    The result (including a failed probe) is cached for IP_CACHE_SECONDS.
+    """
+    now = time.monotonic()
+    if _ip_cache['time'] is not None and now - _ip_cache['time'] < IP_CACHE_SECONDS:
+        return _ip_cache['ip']
+    
+    ip_address = None
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.2)
+            s.connect(("8.8.8.8", 80))
+            ip_address = s.getsockname()[0]
+    except OSError:
+        pass
+    
+    _ip_cache['ip'] = ip_address
+    _ip_cache['time'] = now
+    return ip_address
+
+# Per-composer layer id counters, so ids are not reused after a removal
+layer_counters = weakref.WeakKeyDictionary()
+
+def new_layer_id(composer, prefix):
+    """Return an unused layer id such as 'text_3' for a composition."""
+    counter = layer_counters.get(composer)
+    if counter is None:
+        counter = layer_counters[composer] = itertools.count(len(composer.layers))
+    existing = {layer.id for layer in composer.layers}
+    while True:
+        layer_id = f"{prefix}_{next(counter)}"
+        if layer_id not in existing:
+            return layer_id
+
+# Layer info per composer and its JSON form, computed once per layer revision
+layer_info_cache = weakref.WeakKeyDictionary()
+
+def cached_layer_info(composer):
+    """Get a composition's layer info as {'revision', 'info', 'json'}, reused until its layers change.
     
-    if session_id not in compositions:
-        compositions[session_id] = EinkComposer(250, 128)
+    The returned info is shared; callers that modify it must work on a copy.
+    """
+    entry = layer_info_cache.get(composer)
+    revision = composer.revision
+    if entry is None or entry['revision'] != revision:
+        # Tagged with the revision read before computing, so info computed
+        # while a change is in progress is recomputed on the next call
+        info = composer.get_layer_info()
+        if ORJSON_AVAILABLE:
+            encoded = orjson.dumps(info, default=str,
+                                   option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        else:
+            encoded = json.dumps(info, sort_keys=True, default=str).encode()
+        entry = {'revision': revision, 'info': info, 'json': encoded}
+        layer_info_cache[composer] = entry
+    return entry
+
+def changes_layers(view):
+    """Mark an endpoint as modifying its composition's layers.
+    
+    Bumps the revision of the composition the request used (recorded by
+    get_composition/set_composition), covering direct edits of layer
+    attributes and composer.layers.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        finally:
+            composer = g.pop('composer', None)
+            if composer is not None:
+                composer.mark_changed()
+    return wrapper
+
+# Last rendered frame per composer: {'key', 'frame', 'png', 'image'}; the encoded
+# PNG bytes and base64 data URL are filled in on first use
+frame_cache = weakref.WeakKeyDictionary()
+
+def _frame_key(composer):
+    """Hash everything that affects the rendered frame of a composition."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(struct.pack('>II', composer.width, composer.height))
+    digest.update(cached_layer_info(composer)['json'])
+    # Image pixels are not part of the layer info: hash in-memory arrays
+    # and the modification time of file-backed images
+    for layer in composer.layers:
+        image_data = getattr(layer, 'image_data', None)
+        if image_data is not None:
+            digest.update(np.ascontiguousarray(image_data).data)
+        elif getattr(layer, 'image_path', None):
+            try:
+                digest.update(str(os.stat(layer.image_path).st_mtime_ns).encode())
+            except OSError:
+                pass
+    return digest.digest()
+
+# One lock per composer, so concurrent requests for a session never render
+# into its shared canvas and scratch buffers at the same time
+render_locks = weakref.WeakKeyDictionary()
+render_locks_guard = threading.Lock()
+
+def _render_lock(composer):
+    """Get the render lock of a composer, creating it on first use."""
+    with render_locks_guard:
+        return render_locks.setdefault(composer, threading.Lock())
+
+def render_cached(composer):
+    """Render a composition, reusing the last frame if its state is unchanged.
+    
+    Returns the cache entry; 'frame' is a read-only copy of the render.
+    """
+    with _render_lock(composer):
+        key = _frame_key(composer)
+        entry = frame_cache.get(composer)
+        if entry is None or entry['key'] != key:
+            frame = composer.render().copy()
+            frame.flags.writeable = False
+            entry = {'key': key, 'frame': frame, 'png': None, 'image': None}
+            frame_cache[composer] = entry
+        return entry
+
+def cached_png(entry):
+    """Return the PNG bytes for a render_cached() entry, encoding once."""
+    if entry['png'] is None:
+        frame = entry['frame']
+        # Cleared compositions render all white; reuse one PNG per size
+        if frame.size and frame.min() == 255:
+            entry['png'] = blank_png(frame.shape[1], frame.shape[0])
+        else:
+            entry['png'] = encode_png(frame)
+    return entry['png']
+
+@functools.lru_cache(maxsize=8)
+def blank_png(width, height):
+    """PNG bytes for an all-white frame of the given size."""
+    return encode_png(np.full((height, width), 255, dtype=np.uint8))
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _png_chunk(tag, data):
+    """Build one PNG chunk (length, tag, data, CRC)."""
+    return (struct.pack('>I', len(data)) + tag + data
+            + struct.pack('>I', zlib.crc32(data, zlib.crc32(tag))))
+
+# Scanline buffers are reused per thread between encodes
+_png_scratch = threading.local()
+
+def _scanline_buffer(height, width):
+    """Get this thread's PNG scanline buffer; column 0 holds the (zero) filter bytes."""
+    buf = getattr(_png_scratch, 'buf', None)
+    if buf is None or buf.shape != (height, width + 1):
+        buf = _png_scratch.buf = np.zeros((height, width + 1), dtype=np.uint8)
+    return buf
+
+def encode_png(img_array, level=1):
+    """Encode a 2D uint8 array as an 8-bit grayscale PNG.
     
-    return compositions[session_id]
+    Writes the chunks directly with zlib instead of going through PIL.
+    Every scanline uses filter type 0, and the low default compression
+    level keeps encoding cheap for preview frames.
+    """
+    height, width = img_array.shape
+    scanlines = _scanline_buffer(height, width)
+    scanlines[:, 1:] = img_array
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    return b''.join((
+        _PNG_SIGNATURE,
+        _png_chunk(b'IHDR', header),
+        _png_chunk(b'IDAT', zlib.compress(scanlines.data, level)),
+        _png_chunk(b'IEND', b''),
+    ))
+
+def png_to_base64(png):
+    """Convert PNG bytes to a base64 data URL."""
+    img_str = b64encode(png).decode('ascii')
+    return f"data:image/png;base64,{img_str}"
 
 def array_to_base64(img_array):
     """Convert numpy array to base64 image string."""
-    pil_img = Image.fromarray(img_array, mode='L')
-    buffer = BytesIO()
-    pil_img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    return f"data:image/png;base64,{img_str}"
+    return png_to_base64(encode_png(img_array))
 
 @app.route('/')
 def index():
@@ -71,30 +564,44 @@ def index():
 def preview():
     """Get current composition preview."""
     composer = get_composition()
-    img_array = composer.render()
+    entry = render_cached(composer)
+    if entry['image'] is None:
+        entry['image'] = png_to_base64(cached_png(entry))
     return jsonify({
-        'image': array_to_base64(img_array),
+        'image': entry['image'],
         'width': composer.width,
         'height': composer.height
     })
 
+@app.route('/api/preview.png')
+def preview_png():
+    """Get current composition preview as a PNG image."""
+    composer = get_composition()
+    # BytesIO shares the cached PNG bytes until written to, so no copy is made
+    response = send_file(BytesIO(cached_png(render_cached(composer))), mimetype='image/png')
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Canvas-Width'] = str(composer.width)
+    response.headers['X-Canvas-Height'] = str(composer.height)
+    return response
+
 @app.route('/api/layers')
 def get_layers():
     """Get current layers."""
     composer = get_composition()
-    return jsonify(composer.get_layer_info())
+    return jsonify(cached_layer_info(composer)['info'])
 
 @app.route('/api/add-text', methods=['POST'])
+@changes_layers
 def add_text():
     """Add text layer."""
     try:
         data = request.json
         composer = get_composition()
         
-        text = data.get('text', 'TEXT').upper()  # Force uppercase for testing
-        layer_id = f"text_{len(composer.layers)}"
+        text = data.get('text', 'TEXT')
+        layer_id = new_layer_id(composer, 'text')
         
-        print(f"Adding text layer: '{text}' at ({data.get('x', 0)}, {data.get('y', 0)})")  # Debug
+        app.logger.debug("Adding text layer %r at (%s, %s)", text, data.get('x', 0), data.get('y', 0))
         
         composer.add_text_layer(
             layer_id=layer_id,
@@ -106,19 +613,20 @@ def add_text():
             background=data.get('background', False)
         )
         
-        return jsonify({'success': True, 'layer_id': layer_id, 'debug_text': text})
+        return jsonify({'success': True, 'layer_id': layer_id})
     
     except Exception as e:
-        print(f"Error adding text: {e}")  # Debug
+        app.logger.exception("Error adding text")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/add-rect', methods=['POST'])
+@changes_layers
 def add_rect():
     """Add rectangle layer."""
     data = request.json
     composer = get_composition()
     
-    layer_id = f"rect_{len(composer.layers)}"
+    layer_id = new_layer_id(composer, 'rect')
     composer.add_rectangle_layer(
         layer_id=layer_id,
         x=int(data.get('x', 0)),
@@ -132,6 +640,7 @@ def add_rect():
     return jsonify({'success': True, 'layer_id': layer_id})
 
 @app.route('/api/add-image', methods=['POST'])
+@changes_layers
 def add_image():
     """Add image layer."""
     if 'image' not in request.files:
@@ -142,18 +651,18 @@ def add_image():
         return jsonify({'error': 'No image selected'}), 400
     
     try:
-        # Load image data directly instead of saving to temp file
-        from PIL import Image as PILImage
-        import numpy as np
-        
-        # Load image from memory
-        pil_img = PILImage.open(file.stream).convert('L')
-        img_array = np.array(pil_img)
+        # Load image from memory; JPEGs are decoded straight to 8-bit luma
+        # via draft mode, and grayscale images skip the conversion
+        pil_img = Image.open(file.stream)
+        pil_img.draft('L', pil_img.size)
+        if pil_img.mode != 'L':
+            pil_img = pil_img.convert('L')
+        img_array = np.asarray(pil_img)  # Read-only is fine; layers never write to it
         
         data = request.form
         composer = get_composition()
         
-        layer_id = f"image_{len(composer.layers)}"
+        layer_id = new_layer_id(composer, 'image')
         
         # Create ImageLayer with image data instead of file path
         from eink_composer.composer import ImageLayer
@@ -173,6 +682,7 @@ def add_image():
         return jsonify({'error': f'Error processing image: {str(e)}'}), 500
 
 @app.route('/api/remove-layer', methods=['POST'])
+@changes_layers
 def remove_layer():
     """Remove layer."""
     data = request.json
@@ -182,6 +692,7 @@ def remove_layer():
     return jsonify({'success': success})
 
 @app.route('/api/toggle-layer', methods=['POST'])
+@changes_layers
 def toggle_layer():
     """Toggle layer visibility."""
     data = request.json
@@ -191,6 +702,7 @@ def toggle_layer():
     return jsonify({'success': success})
 
 @app.route('/api/update-layer-position', methods=['POST'])
+@changes_layers
 def update_layer_position():
     """Update layer position."""
     data = request.json
@@ -204,6 +716,7 @@ def update_layer_position():
     return jsonify({'success': success})
 
 @app.route('/api/update-layer/<layer_id>', methods=['POST'])
+@changes_layers
 def update_layer(layer_id):
     """Update layer properties."""
     data = request.json
@@ -227,6 +740,7 @@ def update_layer(layer_id):
     return jsonify({'success': success})
 
 @app.route('/api/move-layer', methods=['POST'])
+@changes_layers
 def move_layer():
     """Move layer to new position."""
     data = request.json
@@ -239,13 +753,14 @@ def move_layer():
     return jsonify({'success': success})
 
 @app.route('/api/add-ip-placeholder', methods=['POST'])
+@changes_layers
 def add_ip_placeholder():
     """Add IP address placeholder layer."""
     try:
         data = request.json
         composer = get_composition()
         
-        layer_id = f"ip_placeholder_{len(composer.layers)}"
+        layer_id = new_layer_id(composer, 'ip_placeholder')
         
         # Create a special placeholder layer type
         from eink_composer.composer import TextLayer
@@ -271,30 +786,19 @@ def add_ip_placeholder():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/add-qr-placeholder', methods=['POST'])
+@changes_layers
 def add_qr_placeholder():
     """Add QR code placeholder layer."""
     try:
         data = request.json
         composer = get_composition()
         
-        layer_id = f"qr_placeholder_{len(composer.layers)}"
+        layer_id = new_layer_id(composer, 'qr_placeholder')
         
-        # Create placeholder QR code (small black square for preview)
-        import numpy as np
+        # Create placeholder QR code (bordered square for preview)
         width = int(data.get('width', 70))
         height = int(data.get('height', 70))
-        
-        # Create a placeholder pattern for preview
-        placeholder_img = np.full((height, width), 255, dtype=np.uint8)  # White background
-        # Add a simple border and "QR" text pattern
-        placeholder_img[0:2, :] = 0  # Top border
-        placeholder_img[-2:, :] = 0  # Bottom border 
-        placeholder_img[:, 0:2] = 0  # Left border
-        placeholder_img[:, -2:] = 0  # Right border
-        
-        # Add "QR" text in center (simplified)
-        center_y, center_x = height // 2, width // 2
-        placeholder_img[center_y-5:center_y+5, center_x-10:center_x+10] = 0
+        placeholder_img = make_qr_placeholder(width, height)
         
         from eink_composer.composer import ImageLayer
         layer = ImageLayer(
@@ -303,7 +807,8 @@ def add_qr_placeholder():
             y=int(data.get('y', 0)),
             image_data=placeholder_img,
             width=width,
-            height=height
+            height=height,
+            already_binary=True
         )
         
         # Add metadata to identify this as a placeholder
@@ -317,58 +822,59 @@ def add_qr_placeholder():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/clear')
+@changes_layers
 def clear_all():
     """Clear all layers."""
     composer = get_composition()
     composer.layers.clear()
     return jsonify({'success': True})
 
-@app.route('/api/display', methods=['POST'])
-def display_hardware():
-    """Display on e-ink hardware."""
-    if not HARDWARE_AVAILABLE:
-        return jsonify({'error': 'Hardware SDK not available'}), 400
-    
-    temp_file = None
-    display = None
+# Shared hardware display, initialized on first use and kept open; SPI
+# access from concurrent requests is serialized through display_lock
+_display = None
+display_lock = threading.Lock()
+
+def get_display():
+    """Return the shared Display, creating and initializing it on first use.
     
-    try:
-        composer = get_composition()
-        
-        # Get the image and transform it for hardware orientation
-        img_array = composer.render()  # (128, 250) array for 250x128 design
-        
-        # Apply flip vertical (always)
-        img_array = np.flipud(img_array)  # Flip up-down
-        
-        # Rotate 90° counterclockwise: (128, 250) -> (250, 128) for hardware
-        rotated_array = np.rot90(img_array, k=1)  # k=1 means 90° counterclockwise
-        
-        # Save rotated image
-        temp_file = "/tmp/web_eink_display.png"
-        from PIL import Image
-        pil_img = Image.fromarray(rotated_array, mode='L')
-        pil_img.save(temp_file)
-        
-        # Verify the PNG was created and is valid
-        if not os.path.exists(temp_file):
-            return jsonify({'error': 'Failed to create temporary PNG file'}), 500
-        
-        file_size = os.path.getsize(temp_file)
-        if file_size == 0:
-            return jsonify({'error': 'Created PNG file is empty'}), 500
-        
-        # Try to create display object
+    Must be called with display_lock held. Raises if the display cannot be
+    created or initialized, in which case nothing is kept.
+    """
+    global _display
+    if _display is None:
+        display = Display(auto_init=False)
+        display.initialize()
+        _display = display
+    return _display
+
+def reset_display():
+    """Close the shared Display so the next request re-initializes it."""
+    global _display
+    if _display is not None:
         try:
-            display = Display(auto_init=False)
-        except Exception as e:
-            return jsonify({'error': f'Failed to create Display object: {str(e)}'}), 500
-        
-        # Try to initialize display
+            _display.close()
+        except Exception:
+            pass
+        _display = None
+
+atexit.register(reset_display)
+
+def show_png_on_display(png, partial=False):
+    """Show a hardware-oriented PNG on the shared display.
+    
+    Returns:
+        (response payload, HTTP status) tuple
+    """
+    file_size = len(png)
+    temp_file = DISPLAY_PNG_PATH
+    mode = DisplayMode.PARTIAL if partial else DisplayMode.FULL
+    
+    with display_lock:
+        # Get the shared display, initializing it if needed
         try:
-            display.initialize()
+            display = get_display()
         except Exception as e:
-            return jsonify({
+            return {
                 'error': f'Hardware initialization failed: {str(e)}',
                 'details': 'The e-ink display hardware is not responding. This could be because:\n'
                           '• The hardware is not connected\n'
@@ -377,48 +883,110 @@ def display_hardware():
                           '• Running in development/simulation environment',
                 'file_created': True,
                 'file_size': file_size
-            }), 500
-        
-        # Try to display the image
-        data = request.json or {}
-        mode = DisplayMode.PARTIAL if data.get('partial') else DisplayMode.FULL
+            }, 500
         
         try:
             # Convert the rotated PNG to raw data and display
+            with open(temp_file, 'wb') as f:
+                f.write(png)
             raw_data = display.convert_png_to_raw(temp_file)
             display._display_raw(raw_data, mode)
-            return jsonify({
+            return {
                 'success': True,
                 'file_size': file_size,
-                'mode': 'PARTIAL' if data.get('partial') else 'FULL'
-            })
+                'mode': 'PARTIAL' if partial else 'FULL'
+            }, 200
         except Exception as e:
-            return jsonify({
+            # The display may be in a bad state; start fresh next time
+            reset_display()
+            return {
                 'error': f'Failed to display PNG image: {str(e)}',
                 'details': 'The PNG file was created successfully but could not be displayed on hardware',
                 'file_created': True,
                 'file_size': file_size
-            }), 500
+            }, 500
+        finally:
+            try:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            except OSError:
+                pass
+
+# E-ink refreshes take seconds, so /api/display hands them to a single
+# background worker and returns at once; clients poll /api/display/status/<id>
+display_queue = queue.Queue()
+display_jobs = OrderedDict()  # job id -> {'status': queued|running|done|error, 'result'}
+MAX_DISPLAY_JOBS = 100
+_jobs_lock = threading.Lock()
+_display_worker = None
+
+def _run_display_jobs():
+    """Background worker: show queued frames one at a time."""
+    while True:
+        job, png, partial = display_queue.get()
+        job['status'] = 'running'
+        try:
+            result, status = show_png_on_display(png, partial)
+        except Exception as e:
+            result, status = {
+                'error': f'Unexpected error: {str(e)}',
+                'details': 'An unexpected error occurred during the display process'
+            }, 500
+        job['result'] = result
+        job['status'] = 'done' if status == 200 else 'error'
+        display_queue.task_done()
+
+def queue_display_job(png, partial=False):
+    """Queue a frame for the display worker, starting it if needed; returns the job id."""
+    global _display_worker
+    job_id = uuid.uuid4().hex
+    job = {'status': 'queued', 'result': None}
+    with _jobs_lock:
+        display_jobs[job_id] = job
+        while len(display_jobs) > MAX_DISPLAY_JOBS:
+            display_jobs.popitem(last=False)
+        if _display_worker is None or not _display_worker.is_alive():
+            _display_worker = threading.Thread(target=_run_display_jobs,
+                                               name='display-worker', daemon=True)
+            _display_worker.start()
+    display_queue.put((job, png, partial))
+    return job_id
+
+@app.route('/api/display', methods=['POST'])
+def display_hardware():
+    """Queue the current composition for display on e-ink hardware."""
+    if not HARDWARE_AVAILABLE:
+        return jsonify({'error': 'Hardware SDK not available'}), 400
+    
+    try:
+        composer = get_composition()
+        
+        # Get the image and transform it for hardware orientation:
+        # flip vertical, then rotate 90° counterclockwise, (128, 250) -> (250, 128).
+        # Together that is a transpose with both axes reversed, copied out in one pass
+        frame = render_cached(composer)['frame']  # (128, 250) array for 250x128 design
+        rotated_array = np.ascontiguousarray(frame.T[::-1, ::-1])
+        
+        # The SDK only reads PNG files; encode here, write in the worker
+        png = encode_png(rotated_array)
+        
+        data = request.json or {}
+        job_id = queue_display_job(png, bool(data.get('partial')))
+        return jsonify({'success': True, 'queued': True, 'job_id': job_id}), 202
     
     except Exception as e:
         return jsonify({
             'error': f'Unexpected error: {str(e)}',
             'details': 'An unexpected error occurred during the display process'
         }), 500
-    
-    finally:
-        # Clean up resources
-        try:
-            if display:
-                display.close()
-        except:
-            pass
-        
-        try:
-            if temp_file and os.path.exists(temp_file):
-                os.remove(temp_file)
-        except:
-            pass
+
+@app.route('/api/display/status/<job_id>')
+def display_status(job_id):
+    """Get the status of a queued display job."""
+    job = display_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown display job'}), 404
+    return jsonify({'job_id': job_id, 'status': job['status'], 'result': job['result']})
 
 @app.route('/api/hardware/clear', methods=['POST'])
 def clear_hardware():
@@ -426,45 +994,33 @@ def clear_hardware():
     if not HARDWARE_AVAILABLE:
         return jsonify({'error': 'Hardware SDK not available'}), 400
     
-    display = None
     try:
-        # Try to create display object
-        try:
-            display = Display(auto_init=False)
-        except Exception as e:
-            return jsonify({'error': f'Failed to create Display object: {str(e)}'}), 500
-        
-        # Try to initialize display
-        try:
-            display.initialize()
-        except Exception as e:
-            return jsonify({
-                'error': f'Hardware initialization failed: {str(e)}',
-                'details': 'Cannot clear display because hardware initialization failed'
-            }), 500
-        
-        # Try to clear the display
-        try:
-            display.clear()
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({
-                'error': f'Failed to clear display: {str(e)}',
-                'details': 'Hardware is initialized but clear operation failed'
-            }), 500
+        with display_lock:
+            # Get the shared display, initializing it if needed
+            try:
+                display = get_display()
+            except Exception as e:
+                return jsonify({
+                    'error': f'Hardware initialization failed: {str(e)}',
+                    'details': 'Cannot clear display because hardware initialization failed'
+                }), 500
+            
+            # Try to clear the display
+            try:
+                display.clear()
+                return jsonify({'success': True})
+            except Exception as e:
+                reset_display()
+                return jsonify({
+                    'error': f'Failed to clear display: {str(e)}',
+                    'details': 'Hardware is initialized but clear operation failed'
+                }), 500
     
     except Exception as e:
         return jsonify({
             'error': f'Unexpected error: {str(e)}',
             'details': 'An unexpected error occurred during the clear process'
         }), 500
-    
-    finally:
-        try:
-            if display:
-                display.close()
-        except:
-            pass
 
 @app.route('/api/hardware/info')
 def hardware_info():
@@ -483,50 +1039,51 @@ def hardware_info():
     }
     
     # Try to get more detailed hardware information
-    display = None
-    try:
-        display = Display(auto_init=False)
-        info['display_object'] = True
-        
-        # Try to get dimensions without initializing
+    probe = None
+    with display_lock:
         try:
-            width, height = display.get_dimensions()
-            info['display_size'] = f'{width}x{height}'
-            info['width'] = width
-            info['height'] = height
-        except Exception as e:
-            info['display_size'] = 'Unknown'
-            info['dimension_error'] = str(e)
-        
-        # Try to get firmware info
-        try:
-            firmware = display.get_firmware()
-            info['firmware'] = firmware
+            # Test initialization status through the shared display
+            try:
+                display = get_display()
+                info['hardware_init'] = True
+                info['hardware_status'] = 'Available and working'
+            except Exception as e:
+                info['hardware_init'] = False
+                info['hardware_status'] = 'SDK available but hardware initialization failed'
+                info['init_error'] = str(e)
+                # Still report what the SDK knows without initializing
+                display = probe = Display(auto_init=False)
+            info['display_object'] = True
+            
+            # Try to get dimensions
+            try:
+                width, height = display.get_dimensions()
+                info['display_size'] = f'{width}x{height}'
+                info['width'] = width
+                info['height'] = height
+            except Exception as e:
+                info['display_size'] = 'Unknown'
+                info['dimension_error'] = str(e)
+            
+            # Try to get firmware info
+            try:
+                firmware = display.get_firmware()
+                info['firmware'] = firmware
+            except Exception as e:
+                info['firmware'] = 'Unknown'
+                info['firmware_error'] = str(e)
+                
         except Exception as e:
-            info['firmware'] = 'Unknown'
-            info['firmware_error'] = str(e)
+            info['display_object'] = False
+            info['display_error'] = str(e)
+            info['hardware_status'] = 'SDK available but Display object creation failed'
         
-        # Test initialization status
-        try:
-            display.initialize()
-            info['hardware_init'] = True
-            info['hardware_status'] = 'Available and working'
-        except Exception as e:
-            info['hardware_init'] = False
-            info['hardware_status'] = 'SDK available but hardware initialization failed'
-            info['init_error'] = str(e)
-            
-    except Exception as e:
-        info['display_object'] = False
-        info['display_error'] = str(e)
-        info['hardware_status'] = 'SDK available but Display object creation failed'
-    
-    finally:
-        try:
-            if display:
-                display.close()
-        except:
-            pass
+        finally:
+            try:
+                if probe:
+                    probe.close()
+            except:
+                pass
     
     return jsonify(info)
 
@@ -535,14 +1092,8 @@ def save_template():
     """Save current composition as template."""
     composer = get_composition()
     
-    # Get layer info and add placeholder metadata
-    layers = composer.get_layer_info()
-    for i, layer in enumerate(layers):
-        composer_layer = composer.layers[i]
-        if hasattr(composer_layer, 'placeholder_type'):
-            layer['placeholder_type'] = composer_layer.placeholder_type
-            if hasattr(composer_layer, 'error_correction'):
-                layer['error_correction'] = composer_layer.error_correction
+    # Layer info already carries placeholder_type/error_correction
+    layers = cached_layer_info(composer)['info']
     
     template_data = {
         'width': composer.width,
@@ -560,6 +1111,7 @@ def save_template():
     })
 
 @app.route('/api/load-template', methods=['POST'])
+@changes_layers
 def load_template():
     """Load template from JSON."""
     try:
@@ -570,9 +1122,8 @@ def load_template():
             return jsonify({'error': 'No template data'}), 400
         
         # Create new composer
-        session_id = session['session_id']
-        compositions[session_id] = EinkComposer(250, 128)
-        composer = compositions[session_id]
+        composer = EinkComposer(250, 128)
+        set_composition(composer)
         
         # Restore layers
         for layer_data in template.get('layers', []):
@@ -616,16 +1167,11 @@ def download_png():
     """Download current composition as PNG."""
     composer = get_composition()
     
-    # Save to memory buffer
-    img_array = composer.render()
-    pil_img = Image.fromarray(img_array, mode='L')
-    
-    buffer = BytesIO()
-    pil_img.save(buffer, format='PNG')
-    buffer.seek(0)
+    # BytesIO shares the cached PNG bytes until written to, so no copy is made
+    png = cached_png(render_cached(composer))
     
     return send_file(
-        buffer,
+        BytesIO(png),
         mimetype='image/png',
         as_attachment=True,
         download_name='eink_composition.png'
@@ -645,14 +1191,13 @@ def export_template():
         image_files = []  # Track image files to copy
         
         # Process each layer info and handle images
-        for i, layer_info in enumerate(layers_info):
-            layer = composer.layers[i]  # Get corresponding layer object
-            
+        for layer_info, layer in zip(layers_info, composer.layers):
             # Handle background images - convert to relative paths
             if layer_info.get('type') == 'image':
-                if hasattr(layer, 'image_path') and layer.image_path:
+                original_path = getattr(layer, 'image_path', None)
+                image_data = getattr(layer, 'image_data', None)
+                if original_path:
                     # File-based image with existing path
-                    original_path = layer.image_path
                     filename = os.path.basename(original_path)
                     relative_path = f"./{filename}"
                     
@@ -665,7 +1210,7 @@ def export_template():
                         'filename': filename,
                         'source_type': 'file'
                     })
-                elif hasattr(layer, 'image_data') and layer.image_data is not None:
+                elif image_data is not None:
                     # Memory-based uploaded image (from Mac laptop, etc.)
                     filename = f"{layer.id}.png"  # Generate filename from layer ID
                     relative_path = f"./{filename}"
@@ -676,7 +1221,7 @@ def export_template():
                     # Track image data for saving
                     image_files.append({
                         'filename': filename,
-                        'image_data': layer.image_data,
+                        'image_data': image_data,
                         'source_type': 'memory'
                     })
         
@@ -690,13 +1235,15 @@ def export_template():
                 dst_path = os.path.join(template_dir, img_file['filename'])
                 
                 if img_file['source_type'] == 'file':
-                    # File-based image - copy from original path
-                    import shutil
+                    # File-based image - copy the contents only (copyfile uses
+                    # sendfile on Linux and skips copy2's metadata syscalls)
                     src_path = img_file['original']
-                    if os.path.exists(src_path):
-                        shutil.copy2(src_path, dst_path)
-                    else:
-                        print(f"Warning: Source file {src_path} not found")
+                    try:
+                        shutil.copyfile(src_path, dst_path)
+                    except FileNotFoundError:
+                        app.logger.warning("Source file %s not found", src_path)
+                    except shutil.SameFileError:
+                        pass  # Re-exporting a template into its own directory
                         
                 elif img_file['source_type'] == 'memory':
                     # Memory-based uploaded image - save from image_data
@@ -705,7 +1252,7 @@ def export_template():
                     pil_img.save(dst_path)
                     
             except Exception as e:
-                print(f"Warning: Could not save image file {img_file['filename']}: {e}")
+                app.logger.warning("Could not save image file %s: %s", img_file['filename'], e)
         
         # Create template data
         template_data = {
@@ -719,8 +1266,8 @@ def export_template():
         
         # Save template.json to package directory  
         template_json_path = os.path.join(template_dir, 'template.json')
-        with open(template_json_path, 'w') as f:
-            json.dump(template_data, f, indent=2)
+        pretty = request.args.get('pretty') == '1' or bool(data.get('pretty'))
+        write_json_file(template_json_path, template_data, pretty=pretty)
         
         return jsonify({
             'success': True,
@@ -731,190 +1278,255 @@ def export_template():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Field defaults for imported template layers, by layer type
+_TEXT_LAYER_DEFAULTS = {'text': '', 'x': 0, 'y': 0, 'color': 0, 'font_size': 1, 'background': False,
+                        'rotate': 0, 'flip_h': False, 'flip_v': False, 'padding': 2}
+_RECT_LAYER_DEFAULTS = {'x': 0, 'y': 0, 'width': 50, 'height': 50, 'filled': True, 'color': 0}
+_QR_LAYER_DEFAULTS = {'x': 0, 'y': 0, 'width': 70, 'height': 70, 'error_correction': 'M'}
+_IMAGE_LAYER_DEFAULTS = {'x': 0, 'y': 0, 'resize_mode': 'fit', 'dither_mode': 'floyd-steinberg',
+                         'brightness': 1.0, 'contrast': 0.0, 'rotate': 0, 'flip_h': False,
+                         'flip_v': False, 'width': None, 'height': None}
+
 @app.route('/api/import-template', methods=['POST'])
+@changes_layers
 def import_template():
     """Import template package and replace current composition."""
-    try:
-        template_data = request.json.get('template_data')
-        template_path = request.json.get('template_path', '')  # Path to template folder
-        
-        if not template_data:
-            return jsonify({'error': 'No template data provided'}), 400
-        
-        # Clear current composition
-        session_id = session.get('session_id')
-        if session_id and session_id in compositions:
-            del compositions[session_id]
-        
-        # Create new composition with template dimensions
-        width = template_data.get('width', 250)
-        height = template_data.get('height', 128)
-        composer = EinkComposer(width, height)
-        
-        # Get system IP address for dynamic replacement
-        import socket
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip_address = s.getsockname()[0]
-            s.close()
-        except:
-            ip_address = "192.168.0.147"  # Fallback
+    template_data = request.json.get('template_data')
+    template_path = request.json.get('template_path', '')  # Path to template folder
+    
+    if not template_data:
+        return jsonify({'error': 'No template data provided'}), 400
+    
+    # Clear current composition
+    session_id = _session_id()
+    with compositions_lock:
+        compositions.pop(session_id, None)
+        spilling.pop(session_id, None)
+    _drop_spilled_composition(session_id)
+    
+    # Create new composition with template dimensions
+    width = template_data.get('width', 250)
+    height = template_data.get('height', 128)
+    composer = EinkComposer(width, height)
+    
+    # Get system IP address for dynamic replacement
+    ip_address = get_local_ip() or "192.168.0.147"  # Fallback
+    
+    # Add layers from template; each layer's data is merged over its
+    # type's defaults once, so fields are read with plain subscripts
+    for layer_data in template_data.get('layers', []):
+        layer_type = layer_data.get('type', '')
         
-        # Add layers from template
-        for layer_data in template_data.get('layers', []):
-            layer_type = layer_data.get('type', '')
-            
+        # Add layer based on type
+        if layer_type == 'text':
+            ld = {**_TEXT_LAYER_DEFAULTS, **layer_data}
             # Handle dynamic IP replacement
-            if layer_data.get('placeholder_type') == 'ip' and layer_type == 'text':
-                layer_data['text'] = ip_address
-            
-            # Add layer based on type
-            if layer_type == 'text':
-                composer.add_text_layer(
-                    layer_id=layer_data.get('id', f"text_{len(composer.layers)}"),
-                    text=layer_data.get('text', ''),
-                    x=layer_data.get('x', 0),
-                    y=layer_data.get('y', 0),
-                    color=layer_data.get('color', 0),
-                    font_size=layer_data.get('font_size', 1),
-                    background=layer_data.get('background', False),
-                    rotate=layer_data.get('rotate', 0),
-                    flip_h=layer_data.get('flip_h', False),
-                    flip_v=layer_data.get('flip_v', False),
-                    padding=layer_data.get('padding', 2)
+            if ld.get('placeholder_type') == 'ip':
+                ld['text'] = ip_address
+            composer.add_text_layer(
+                layer_id=ld.get('id') or new_layer_id(composer, 'text'),
+                text=ld['text'],
+                x=ld['x'],
+                y=ld['y'],
+                color=ld['color'],
+                font_size=ld['font_size'],
+                background=ld['background'],
+                rotate=ld['rotate'],
+                flip_h=ld['flip_h'],
+                flip_v=ld['flip_v'],
+                padding=ld['padding']
+            )
+        elif layer_type == 'rectangle':
+            ld = {**_RECT_LAYER_DEFAULTS, **layer_data}
+            composer.add_rectangle_layer(
+                layer_id=ld.get('id') or new_layer_id(composer, 'rect'),
+                x=ld['x'],
+                y=ld['y'],
+                width=ld['width'],
+                height=ld['height'],
+                filled=ld['filled'],
+                color=ld['color']
+            )
+        elif layer_type == 'image':
+            # For QR placeholder, create a simple placeholder (same logic as add_qr_placeholder endpoint)
+            if layer_data.get('placeholder_type') == 'qr':
+                from eink_composer.composer import ImageLayer
+                
+                ld = {**_QR_LAYER_DEFAULTS, **layer_data}
+                qr_width = int(ld['width'])
+                qr_height = int(ld['height'])
+                placeholder_img = make_qr_placeholder(qr_width, qr_height)
+                
+                layer = ImageLayer(
+                    id=ld.get('id') or new_layer_id(composer, 'qr_placeholder'),
+                    x=int(ld['x']),
+                    y=int(ld['y']),
+                    image_data=placeholder_img,
+                    width=qr_width,
+                    height=qr_height,
+                    already_binary=True
                 )
-            elif layer_type == 'rectangle':
-                composer.add_rectangle_layer(
-                    layer_id=layer_data.get('id', f"rect_{len(composer.layers)}"),
-                    x=layer_data.get('x', 0),
-                    y=layer_data.get('y', 0),
-                    width=layer_data.get('width', 50),
-                    height=layer_data.get('height', 50),
-                    filled=layer_data.get('filled', True),
-                    color=layer_data.get('color', 0)
+                layer.placeholder_type = 'qr'
+                layer.error_correction = ld['error_correction']
+                composer.layers.append(layer)
+            elif layer_data.get('image_path'):
+                ld = {**_IMAGE_LAYER_DEFAULTS, **layer_data}
+                # Resolve relative image paths
+                image_path = ld['image_path']
+                if image_path.startswith('./') and template_path:
+                    # Convert relative path to absolute path
+                    image_path = os.path.join(template_path, image_path[2:])
+                
+                composer.add_image_layer(
+                    layer_id=ld.get('id') or new_layer_id(composer, 'img'),
+                    image_path=image_path,
+                    x=ld['x'],
+                    y=ld['y'],
+                    resize_mode=ld['resize_mode'],
+                    dither_mode=ld['dither_mode'],
+                    brightness=ld['brightness'],
+                    contrast=ld['contrast'],
+                    rotate=ld['rotate'],
+                    flip_h=ld['flip_h'],
+                    flip_v=ld['flip_v'],
+                    width=ld['width'],
+                    height=ld['height']
                 )
-            elif layer_type == 'image':
-                # For QR placeholder, create a simple placeholder (same logic as add_qr_placeholder endpoint)
-                if layer_data.get('placeholder_type') == 'qr':
-                    import numpy as np
-                    from eink_composer.composer import ImageLayer
-                    
-                    width = int(layer_data.get('width', 70))
-                    height = int(layer_data.get('height', 70))
-                    
-                    # Create placeholder pattern for preview
-                    placeholder_img = np.full((height, width), 255, dtype=np.uint8)
-                    placeholder_img[0:2, :] = 0  # Top border
-                    placeholder_img[-2:, :] = 0  # Bottom border
-                    placeholder_img[:, 0:2] = 0  # Left border 
-                    placeholder_img[:, -2:] = 0  # Right border
-                    
-                    # Add "QR" text in center
-                    center_y, center_x = height // 2, width // 2
-                    if height > 10 and width > 20:
-                        placeholder_img[max(0, center_y-5):min(height, center_y+5), 
-                                      max(0, center_x-10):min(width, center_x+10)] = 0
-                    
-                    layer = ImageLayer(
-                        id=layer_data.get('id', f"qr_placeholder_{len(composer.layers)}"),
-                        x=int(layer_data.get('x', 0)),
-                        y=int(layer_data.get('y', 0)),
-                        image_data=placeholder_img,
-                        width=width,
-                        height=height
-                    )
-                    layer.placeholder_type = 'qr'
-                    layer.error_correction = layer_data.get('error_correction', 'M')
-                    composer.layers.append(layer)
-                elif layer_data.get('image_path'):
-                    # Resolve relative image paths
-                    image_path = layer_data.get('image_path')
-                    if image_path.startswith('./') and template_path:
-                        # Convert relative path to absolute path
-                        image_path = os.path.join(template_path, image_path[2:])
-                    
-                    composer.add_image_layer(
-                        layer_id=layer_data.get('id', f"img_{len(composer.layers)}"),
-                        image_path=image_path,
-                        x=layer_data.get('x', 0),
-                        y=layer_data.get('y', 0),
-                        resize_mode=layer_data.get('resize_mode', 'fit'),
-                        dither_mode=layer_data.get('dither_mode', 'floyd-steinberg'),
-                        brightness=layer_data.get('brightness', 1.0),
-                        contrast=layer_data.get('contrast', 0.0),
-                        rotate=layer_data.get('rotate', 0),
-                        flip_h=layer_data.get('flip_h', False),
-                        flip_v=layer_data.get('flip_v', False),
-                        width=layer_data.get('width'),
-                        height=layer_data.get('height')
-                    )
-        
-        # Store in session
-        if not session.get('session_id'):
-            session['session_id'] = str(uuid.uuid4())
-        compositions[session['session_id']] = composer
-        
-        return jsonify({'success': True, 'message': 'Template imported successfully'})
+    
+    # Store in session
+    set_composition(composer)
+    
+    return jsonify({'success': True, 'message': 'Template imported successfully'})
+
+# (key, serialized body) of the last /api/list-templates response
+_templates_cache = None
+
+# Threads used to parse template.json files when the listing is rebuilt
+TEMPLATE_SCAN_WORKERS = 8
+
+@functools.lru_cache(maxsize=256)
+def _load_template_meta(path, mtime_ns):
+    """Parse the listing fields of a template.json; mtime_ns keys the cache."""
+    template_data = read_json_file(path)
+    return {
+        'name': template_data.get('name'),
+        'created': template_data.get('created', ''),
+        'layers_count': len(template_data.get('layers', [])),
+    }
+
+def _try_load_template_meta(job):
+    """Load one (path, mtime_ns) job's metadata, returning the exception on failure."""
+    try:
+        return _load_template_meta(*job)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return e
 
 @app.route('/api/list-templates')
 def list_templates():
     """List available template packages."""
+    global _templates_cache
+    templates_dir = 'templates'
+    
+    # One stat per template.json; the parsed listing is reused until any
+    # of them (or the directory itself) changes
+    found = []
     try:
-        templates = []
-        templates_dir = 'templates'
-        
-        if os.path.exists(templates_dir):
-            for item in os.listdir(templates_dir):
-                item_path = os.path.join(templates_dir, item)
-                template_json_path = os.path.join(item_path, 'template.json')
-                
-                if os.path.isdir(item_path) and os.path.exists(template_json_path):
-                    try:
-                        with open(template_json_path, 'r') as f:
-                            template_data = json.load(f)
-                        
-                        templates.append({
-                            'name': item,
-                            'display_name': template_data.get('name', item),
-                            'created': template_data.get('created', ''),
-                            'path': item_path,
-                            'layers_count': len(template_data.get('layers', []))
-                        })
-                    except Exception as e:
-                        print(f"Warning: Could not read template {item}: {e}")
-        
-        return jsonify({'templates': templates})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        key = [os.stat(templates_dir).st_mtime_ns]
+        with os.scandir(templates_dir) as it:
+            for entry in it:
+                # is_dir() comes from the readdir result (symlinks still followed)
+                template_json_path = entry.path + '/template.json'
+                try:
+                    if not entry.is_dir():
+                        continue
+                    mtime_ns = os.stat(template_json_path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    # Skip unreadable entries instead of failing the whole listing
+                    app.logger.warning("Could not read template %s: %s", entry.name, e)
+                    continue
+                found.append((entry.name, entry.path, template_json_path, mtime_ns))
+                key.append((entry.name, mtime_ns))
+        key = tuple(key)
+    except FileNotFoundError:
+        key = None
+    
+    cached = _templates_cache
+    if cached is not None and cached[0] == key:
+        return app.response_class(cached[1], mimetype='application/json')
+    
+    # Parse the template.json files concurrently; map() keeps the order
+    jobs = [(path, mtime_ns) for _, _, path, mtime_ns in found]
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(TEMPLATE_SCAN_WORKERS, len(jobs))) as executor:
+            metas = list(executor.map(_try_load_template_meta, jobs))
+    else:
+        metas = list(map(_try_load_template_meta, jobs))
+    
+    templates = []
+    for (item, item_path, _, _), meta in zip(found, metas):
+        if isinstance(meta, Exception):
+            app.logger.warning("Could not read template %s: %s", item, meta)
+            continue
+        templates.append({
+            'name': item,
+            'display_name': item if meta['name'] is None else meta['name'],
+            'created': meta['created'],
+            'path': item_path,
+            'layers_count': meta['layers_count']
+        })
+    
+    body = app.json.dumps({'templates': templates})
+    _templates_cache = (key, body)
+    return app.response_class(body, mimetype='application/json')
 
-@app.route('/api/system-info')
-def get_system_info():
-    """Get system information including IP address."""
-    import socket
-    try:
-        # Get local IP address
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip_address = s.getsockname()[0]
-        s.close()
-    except:
-        ip_address = "192.168.1.100"  # Fallback
+@functools.lru_cache(maxsize=4)
+def _system_info_body(ip_address):
+    """Serialize the system-info payload for an IP address, returning (body, ETag).
     
-    return jsonify({
+    HARDWARE_AVAILABLE is fixed at import time, so the IP is the only input.
+    """
+    body = app.json.dumps({
         'ip_address': ip_address,
         'hardware_available': HARDWARE_AVAILABLE
-    })
+    }).encode()
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+@app.route('/api/system-info')
+def get_system_info():
+    """Get system information including IP address.
+    
+    The body only changes with the IP address, so it is serialized once per
+    address and tagged; clients revalidating with If-None-Match get a 304.
+    """
+    body, etag = _system_info_body(get_local_ip() or "192.168.1.100")  # Fallback
+    
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.max_age = IP_CACHE_SECONDS
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
     os.makedirs('static', exist_ok=True)
     
-    print("Starting E-ink Web UI...")
-    print(f"Hardware available: {HARDWARE_AVAILABLE}")
-    print("Access at: http://localhost:5000")
+    # LOGLEVEL=WARNING silences the startup lines below
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO'))
+    app.logger.info("Starting E-ink Web UI...")
+    app.logger.info("Hardware available: %s", HARDWARE_AVAILABLE)
+    app.logger.info("Access at: http://localhost:5000")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # The debugger and reloader are opt-in (FLASK_DEBUG=1); otherwise serve
+    # with Waitress when installed, falling back to the threaded dev server
+    if os.environ.get('FLASK_DEBUG', '0') == '1':
+        app.run(host='0.0.0.0', port=5000, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            app.logger.warning("Waitress not installed - using Flask dev server (pip install eink-composer[web])")
+            app.run(host='0.0.0.0', port=5000, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=5000, threads=int(os.environ.get('WEB_THREADS', 8)))
\ No newline at end of file